@@ -1,8 +1,53 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes.interview import router as interview_router
+from fastapi.responses import JSONResponse, PlainTextResponse
+from routes.interview import (
+    router as interview_router, question_bank, eval_queue, store, render_pool, exports_janitor,
+    pdf_cache, readiness,
+)
+from services import metrics
+from services import openai_service
+from services import self_check
+from services import tracing
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_providers():
+    """Load provider SDKs off the event loop so startup isn't held up by them."""
+    timings = await asyncio.to_thread(openai_service.warm_up)
+    logger.info("LLM provider warm-up: %s", timings)
+
 
-app = FastAPI(title="AI Interview Bot API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    self_check.check_startup()
+    warmup = asyncio.create_task(warm_up_providers()) if openai_service.LLM_WARMUP else None
+    if question_bank is not None:
+        question_bank.start()
+    eval_queue.start()
+    render_pool.start()
+    exports_janitor.start()
+    if pdf_cache.janitor is not None:
+        pdf_cache.janitor.start()
+    yield
+    if warmup is not None:
+        warmup.cancel()
+    await exports_janitor.stop()
+    if pdf_cache.janitor is not None:
+        await pdf_cache.janitor.stop()
+    render_pool.shutdown()
+    await eval_queue.stop()
+    store.close()
+    if question_bank is not None:
+        await question_bank.stop()
+    tracing.tracer.shutdown()
+
+
+app = FastAPI(title="AI Interview Bot API", lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -18,5 +63,67 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(tracing.TracingMiddleware)
 
 app.include_router(interview_router, prefix="/interview")
+
+
+def _service_metrics():
+    """Gauges and counters read from the services' own stats at scrape time."""
+    store_stats = store.stats()
+    yield metrics.gauge("sessions", "Sessions held by the session store (durable backends: as of the last sweep).", [({}, store_stats["sessions"])])
+    yield metrics.gauge("session_cache_entries", "Sessions in the store's read cache.",
+                        [({}, store_stats["cached_sessions"])])
+    yield metrics.counter("sessions_evicted_total", "Sessions evicted by the store.", [
+        ({"reason": key[len("evicted_"):]}, value) for key, value in store_stats.items() if key.startswith("evicted_")
+    ])
+
+    caches = [("pdf", pdf_cache.stats["hits"] + pdf_cache.stats["disk_hits"], pdf_cache.stats["misses"]),
+              ("llm_client", openai_service.clients.stats["hits"], openai_service.clients.stats["misses"])]
+    if openai_service.question_cache is not None:
+        caches.append(("question", openai_service.question_cache.stats["hits"],
+                       openai_service.question_cache.stats["misses"]))
+    if question_bank is not None:
+        caches.append(("question_bank", question_bank.stats["hits"], question_bank.stats["misses"]))
+    yield metrics.gauge("cache_hit_ratio", "Hits / lookups since start.",
+                        [({"cache": name}, metrics.ratio(h, m)) for name, h, m in caches])
+    yield metrics.gauge("pdf_cache_bytes", "Bytes held by the in-memory PDF cache.", [({}, pdf_cache.size_bytes)])
+
+    yield metrics.gauge("pdf_render_queue_depth", "Renders running or waiting in the pool.",
+                        [({}, render_pool.queue_depth)])
+    yield metrics.counter("pdf_render_rejected_total", "Renders refused because the pool was full.",
+                          [({}, render_pool.stats["rejected"])])
+    yield metrics.gauge("eval_queue_jobs", "Background evaluations queued or running.", [({}, len(eval_queue.jobs))])
+
+    exports = exports_janitor.snapshot()
+    yield metrics.gauge("exports_bytes", "Bytes under exports/generated/.", [({}, exports["bytes"])])
+    yield metrics.counter("exports_reclaimed_bytes_total", "Bytes freed by the exports janitor.",
+                          [({}, exports["bytes_freed"])])
+
+    calls = dict(openai_service.call_stats)
+    for field in ("calls", "retries", "timeouts", "deadline_exceeded", "errors"):
+        yield metrics.counter(f"llm_{field}_total", f"Provider call {field.replace('_', ' ')} per provider.",
+                              [({"provider": p}, s[field]) for p, s in calls.items()])
+    limits = dict(openai_service.rate_limiter.stats)
+    yield metrics.counter("llm_rate_limit_wait_seconds_total", "Time requests spent queued by the rate limiter.",
+                          [({"provider": p}, s["wait_seconds"]) for p, s in limits.items()])
+    yield metrics.gauge("llm_rate_limit_waiting", "Requests currently queued by the rate limiter.",
+                        [({"provider": p}, s["waiting"]) for p, s in limits.items()])
+    yield metrics.gauge("llm_circuit_open", "1 while a provider's circuit breaker is open.",
+                        [({"provider": p}, int(h["state"] == "open"))
+                         for p, h in openai_service.health.snapshot().items()])
+
+
+metrics.REGISTRY.register_collector(_service_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health")
+async def health():
+    report = await readiness()
+    return JSONResponse(status_code=200 if report["status"] == "ok" else 503, content=report)
@@ -1,15 +1,62 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse, Response
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Optional
 from uuid import uuid4
-from schemas import StartRequest, StartResponse, AnswerRequest
-from services.openai_service import generate_questions, evaluate_answer
+from schemas import StartRequest, StartResponse, AnswerRequest, BatchAnswerRequest, BulkExportRequest
+from services.openai_service import (
+    agenerate_questions, aevaluate_answer, aevaluate_answers_batch, astream_evaluation, rate_limiter,
+    has_server_key,
+    health as provider_health, routing_stats, call_stats,
+)
+from services import deadline
+from services.eval_stream import sse_event
 from services.store import SessionStore
-from services.pdf_service import PDFService
+from services.pdf_service import GENERATED_DIR, PDFService
+from services.exports_janitor import build_exports_janitor
+from services.pdf_cache import build_pdf_cache, content_hash, etag_for
+from services.render_pool import RenderOverloaded, build_render_pool
+from services.question_bank import build_question_bank
+from services.eval_queue import EvaluationQueue, JobRunning, QueueFull
+from services.zip_stream import ZipStream
+from services.tracing import span
+from services.provider_sdks import SDKS
+import asyncio
+import hmac
+import io
+import json
 import os
 
-router = APIRouter()
+# Time budget for LLM work done on behalf of one request; clients may ask for less
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "60")) or None
+
+async def request_deadline(x_request_timeout: Optional[float] = Header(None)):
+    """Start the request's deadline; provider calls in the service layer honour it."""
+    seconds = REQUEST_DEADLINE
+    if x_request_timeout and x_request_timeout > 0:
+        seconds = min(seconds, x_request_timeout) if seconds else x_request_timeout
+    token = deadline.start(seconds)
+    try:
+        yield
+    finally:
+        deadline.reset(token)
+
+def _error_status(result: dict) -> int:
+    """504 for LLM work that ran out of time, so clients can tell it from bad input; 400 otherwise."""
+    return 504 if result.get("timeout") else 400
+
+router = APIRouter(dependencies=[Depends(request_deadline)])
 store = SessionStore()
-pdf_service = PDFService()
+exports_janitor = build_exports_janitor(GENERATED_DIR)
+pdf_service = PDFService(janitor=exports_janitor)
+render_pool = build_render_pool()
+pdf_cache = build_pdf_cache()
+question_bank = build_question_bank(agenerate_questions, has_server_key)
+eval_queue = EvaluationQueue(
+    aevaluate_answer,
+    store.asave_answer,
+    concurrency=int(os.getenv("EVAL_QUEUE_CONCURRENCY", "4")),
+    max_pending=int(os.getenv("EVAL_QUEUE_MAX_PENDING", "1000")),
+)
 
 @router.post("/start")
 async def start(req: StartRequest):
@@ -19,14 +66,19 @@ async def start(req: StartRequest):
     provider = (req.model_provider or getattr(req, "provider", None) or "gemini").lower()
     api_key = req.api_key or None
 
-    qs = generate_questions(
-        req.role, req.domain, req.experience, req.mode, num=4,
-        api_key=api_key, provider=provider
-    )
+    # Serve from the pre-generated bank; only go live when the pool is short
+    qs = None
+    if question_bank is not None:
+        qs = question_bank.take(req.role, req.domain, req.experience, req.mode, provider, num=4)
+    if qs is None:
+        qs = await agenerate_questions(
+            req.role, req.domain, req.experience, req.mode, num=4,
+            api_key=api_key, provider=provider
+        )
 
     # If service returned an error dict, relay that with 400
     if isinstance(qs, dict) and qs.get("error"):
-        raise HTTPException(status_code=400, detail=qs["error"])
+        raise HTTPException(status_code=_error_status(qs), detail=qs["error"])
 
     # store meta so evaluation uses same provider/key
     meta = req.dict()
@@ -46,36 +98,95 @@ async def start(req: StartRequest):
     return {"session_id": session_id, "questions": qs}
 
 
+async def readiness() -> dict:
+    """Checks behind the health probes; `status` is "ok" only when all pass."""
+    checks = {
+        "eval_queue": "ok" if eval_queue.running else "stopped",
+        "render_pool": "ok" if render_pool.running else "stopped",
+    }
+    try:
+        await store.aget("__health__")
+        checks["store"] = "ok"
+    except Exception as e:
+        checks["store"] = f"error: {e}"
+    ok = all(v == "ok" for v in checks.values())
+    return {"status": "ok" if ok else "degraded", "checks": checks}
+
+@router.get("/health")
+async def health():
+    """Readiness probe (the frontend polls this)."""
+    report = await readiness()
+    return JSONResponse(status_code=200 if report["status"] == "ok" else 503, content=report)
+
+@router.get("/store/stats")
+async def store_stats():
+    """Session counts and eviction counters for the session store."""
+    return store.stats()
+
+@router.get("/llm/stats")
+async def llm_stats():
+    """Rate limiter queueing, circuit breakers, failover/hedging, retry/timeout counters and SDK imports."""
+    return {
+        "rate_limits": rate_limiter.stats,
+        "providers": provider_health.snapshot(),
+        "routing": routing_stats,
+        "calls": call_stats,
+        "sdks": {name: sdk.snapshot() for name, sdk in SDKS.items()},
+    }
+
+@router.get("/exports/stats")
+async def exports_stats():
+    """Files and bytes under exports/generated/ plus what the janitor has reclaimed."""
+    return exports_janitor.snapshot()
+
 @router.get("/session/{session_id}")
 async def get_session(session_id: str):
-    s = store.get(session_id)
+    s = await store.aget(session_id)
     if not s:
         raise HTTPException(status_code=404, detail="Session not found")
-    return s
+    return Response(content=s.to_json(), media_type="application/json")
 
 @router.post("/session/{session_id}/answer")
-async def submit_answer(session_id: str, data: AnswerRequest):
-    session = store.get(session_id)
+async def submit_answer(session_id: str, data: AnswerRequest, background: bool = False):
+    """Evaluate an answer; with ?background=true, queue it and return 202 with a job id."""
+    session = await store.aget(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    q_obj = next((q for q in session["questions"] if q["id"] == data.question_id), None)
-    if not q_obj:
+    q_rec = session.question(data.question_id)
+    if not q_rec:
         raise HTTPException(status_code=400, detail="Question id not found in session")
+    q_obj = q_rec.to_dict()
+
+    provider = session.meta.provider
+    api_key = session.meta.api_key  # ✅ Allow user key, fallback handled in backend
 
-    provider = session["meta"].get("provider", "gemini")
-    api_key = session["meta"].get("api_key")  # ✅ Allow user key, fallback handled in backend
+    if background:
+        try:
+            job = eval_queue.submit(
+                session_id, q_obj, data.answer,
+                session.meta.mode, session.meta.experience,
+                api_key=api_key, provider=provider
+            )
+        except QueueFull:
+            raise HTTPException(status_code=503, detail="Evaluation queue is full, please retry shortly")
+        except JobRunning:
+            raise HTTPException(
+                status_code=409,
+                detail="This question's answer is already being evaluated; resubmit once it finishes",
+            )
+        return JSONResponse(status_code=202, content=job)
 
-    eval_res = evaluate_answer(
+    eval_res = await aevaluate_answer(
         q_obj, data.answer,
-        session["meta"]["mode"], session["meta"]["experience"],
+        session.meta.mode, session.meta.experience,
         api_key=api_key, provider=provider
     )
 
     # ✅ Fix: use correct variable name and structured error
     if isinstance(eval_res, dict) and eval_res.get("error"):
         raise HTTPException(
-            status_code=400,
+            status_code=_error_status(eval_res),
             detail={
                 "message": eval_res["error"],
                 "provider": provider,
@@ -90,45 +201,157 @@ async def submit_answer(session_id: str, data: AnswerRequest):
             detail={"message": "Unexpected evaluation result format", "provider": provider},
         )
 
-    store.save_answer(session_id, {
+    await store.asave_answer(session_id, {
         "question_id": data.question_id,
         "answer": data.answer,
         "evaluation": eval_res
     })
     return eval_res
 
+@router.get("/session/{session_id}/answer/{question_id}")
+async def get_answer(session_id: str, question_id: int):
+    """Status of a background evaluation, or the stored result once done."""
+    session = await store.aget(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
 
-    store.save_answer(session_id, {
-        "question_id": data.question_id,
-        "answer": data.answer,
-        "evaluation": eval_res
-    })
-    return eval_res
+    job = eval_queue.status(session_id, question_id)
+    if job and job["status"] != "failed":
+        return job
+
+    answer = session.latest_answer(question_id)
+    if answer:
+        return {"question_id": question_id, "status": "done", "evaluation": answer.evaluation}
+    if job:
+        return job
+    raise HTTPException(status_code=404, detail="No answer submitted for this question")
+
+@router.post("/session/{session_id}/answer/stream")
+async def submit_answer_stream(session_id: str, data: AnswerRequest):
+    """Evaluate an answer, streaming feedback and scores as Server-Sent Events."""
+    session = await store.aget(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    q_rec = session.question(data.question_id)
+    if not q_rec:
+        raise HTTPException(status_code=400, detail="Question id not found in session")
+    q_obj = q_rec.to_dict()
+
+    provider = session.meta.provider
+    api_key = session.meta.api_key
+
+    # The body streams after dependencies have exited, so carry the deadline in
+    left = deadline.remaining()
+
+    async def events():
+        with deadline.scope(left):
+            async for event, payload in astream_evaluation(
+                q_obj, data.answer,
+                session.meta.mode, session.meta.experience,
+                api_key=api_key, provider=provider
+            ):
+                if event == "result":
+                    if not isinstance(payload, dict) or payload.get("error"):
+                        message = payload.get("error") if isinstance(payload, dict) else "Unexpected evaluation result format"
+                        yield sse_event("error", {"message": message, "provider": provider, "used_user_key": bool(api_key)})
+                        return
+                    await store.asave_answer(session_id, {
+                        "question_id": data.question_id,
+                        "answer": data.answer,
+                        "evaluation": payload
+                    })
+                yield sse_event(event, payload)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/session/{session_id}/answers:batch")
+async def submit_answers_batch(session_id: str, data: BatchAnswerRequest):
+    """Evaluate several answers with a single LLM call."""
+    session = await store.aget(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not data.answers:
+        raise HTTPException(status_code=400, detail="No answers provided")
+    if len(data.answers) > len(session.questions):
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {len(session.questions)} answers per batch (one per question)",
+        )
+    ids = [a.question_id for a in data.answers]
+    duplicates = sorted({qid for qid in ids if ids.count(qid) > 1})
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate question id(s) in batch: {duplicates}")
+
+    questions = {q.id: q.to_dict() for q in session.questions}
+    missing = [a.question_id for a in data.answers if a.question_id not in questions]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Question id(s) not found in session: {missing}")
+
+    provider = session.meta.provider
+    api_key = session.meta.api_key
+
+    results = await aevaluate_answers_batch(
+        [(questions[a.question_id], a.answer) for a in data.answers],
+        session.meta.mode, session.meta.experience,
+        api_key=api_key, provider=provider
+    )
+
+    if isinstance(results, dict) and results.get("error"):
+        raise HTTPException(
+            status_code=_error_status(results),
+            detail={
+                "message": results["error"],
+                "provider": provider,
+                "used_user_key": bool(api_key)
+            }
+        )
+
+    out = []
+    for a, eval_res in zip(data.answers, results):
+        # Items whose individual fallback also failed are reported, not stored
+        if not isinstance(eval_res, dict) or eval_res.get("error"):
+            message = eval_res.get("error") if isinstance(eval_res, dict) else "Unexpected evaluation result format"
+            out.append({"question_id": a.question_id, "error": message})
+            continue
+        await store.asave_answer(session_id, {
+            "question_id": a.question_id,
+            "answer": a.answer,
+            "evaluation": eval_res
+        })
+        out.append(eval_res)
+    return {"results": out}
 
 @router.post("/session/{session_id}/finalize")
 async def finalize(session_id: str):
-    session = store.get(session_id)
+    # Bypass the read cache so answers saved by other workers are counted
+    session = await store.aget(session_id, fresh=True)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    answers = session.get("answers", [])
+    if eval_queue.pending(session_id):
+        raise HTTPException(status_code=409, detail="Answers are still being evaluated, please retry shortly")
+    answers = session.answers
     if not answers:
         raise HTTPException(status_code=400, detail="No answers provided")
     total_tech = total_comm = total_conf = 0
     resources = []
     for a in answers:
-        ev = a["evaluation"]
-        sc = ev.get("scores", {})
+        sc = a.scores
         total_tech += sc.get("technical", 0)
         total_comm += sc.get("communication", 0)
         total_conf += sc.get("confidence", 0)
-        resources += ev.get("resources", []) if ev.get("resources") else []
+        resources += a.resources or []
 
     n = len(answers)
     avg_tech = round(total_tech / n, 1)
     avg_comm = round(total_comm / n, 1)
     avg_conf = round(total_conf / n, 1)
 
-    mode = session["meta"].get("mode", "technical")
+    mode = session.meta.mode or "technical"
     if mode == "technical":
         overall = round((avg_tech*0.5 + avg_comm*0.25 + avg_conf*0.25), 1)
     else:
@@ -142,121 +365,199 @@ async def finalize(session_id: str):
         "resources": list(dict.fromkeys(resources)),
         "n_questions": n
     }
-    store.finalize(session_id, report)
+    await store.afinalize(session_id, report)
     return report
 
-@router.get("/session/{session_id}/export/full")
-async def export_full_report(session_id: str):
-    """Export complete interview report as PDF."""
-    session = store.get(session_id)
+async def _completed_session(session_id: str):
+    session = await store.aget(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    if session.get("status") != "completed":
+    if session.status != "completed":
         raise HTTPException(status_code=400, detail="Session not completed. Please finalize the session first.")
-    
+    return session
+
+async def _render_cached(session_id: str, session, kind: str):
+    """Rendered PDF bytes and cache key; raises RenderOverloaded when the pool is full."""
+    key = _pdf_key(session_id, session, kind)
+    with span("pdf.render", kind=kind) as s:
+        pdf = await pdf_cache.aget(key)
+        s.set(cached=pdf is not None)
+        if pdf is None:
+            pdf = await render_pool.render(kind, session.to_dict(), session.final_report or {})
+            await pdf_cache.aput(key, pdf)
+    return pdf, key
+
+async def _render_pdf(session_id: str, session, kind: str):
+    """Rendered PDF for a report variant, from the cache when the content is unchanged.
+
+    Returns (pdf bytes, download filename, cache key).
+    """
+    filename = pdf_service.report_filename(kind, session.to_dict())
     try:
-        report_data = session.get("final_report", {})
-        pdf_path = pdf_service.generate_interview_report_pdf(session, report_data)
-        
-        # Get filename from path
-        filename = os.path.basename(pdf_path)
-        
-        return FileResponse(
-            path=pdf_path,
-            filename=filename,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        pdf, key = await _render_cached(session_id, session, kind)
+    except RenderOverloaded:
+        raise HTTPException(
+            status_code=503,
+            detail="PDF renderer is busy, please retry shortly",
+            headers={"Retry-After": "2"},
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
+    return pdf, filename, key
+
+def _pdf_key(session_id: str, session, kind: str):
+    return (session_id, kind, content_hash([a.to_dict() for a in session.answers], session.final_report))
+
+def _not_modified(session_id: str, session, kind: str, fmt: str, if_none_match: Optional[str]):
+    """304 response when the client already holds the current render, else None."""
+    if not if_none_match:
+        return None
+    etag = etag_for(_pdf_key(session_id, session, kind), fmt)
+    if etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+PDF_CHUNK_SIZE = 64 * 1024
+
+def _pdf_response(pdf: bytes, filename: str, key):
+    buffer = io.BytesIO(pdf)
+    return StreamingResponse(
+        iter(lambda: buffer.read(PDF_CHUNK_SIZE), b""),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(len(pdf)),
+            "ETag": etag_for(key, "pdf"),
+        }
+    )
+
+def _base64_response(pdf: bytes, filename: str, key):
+    return JSONResponse(
+        content={
+            "filename": filename,
+            "pdf_data": pdf_service.encode_base64(pdf),
+            "content_type": "application/pdf"
+        },
+        headers={"ETag": etag_for(key, "b64")},
+    )
+
+@router.get("/session/{session_id}/export/full")
+async def export_full_report(session_id: str, if_none_match: Optional[str] = Header(None)):
+    """Export complete interview report as PDF."""
+    session = await _completed_session(session_id)
+    return _not_modified(session_id, session, "report", "pdf", if_none_match) or \
+        _pdf_response(*await _render_pdf(session_id, session, "report"))
 
 @router.get("/session/{session_id}/export/summary")
-async def export_summary_report(session_id: str):
+async def export_summary_report(session_id: str, if_none_match: Optional[str] = Header(None)):
     """Export interview summary as PDF."""
-    session = store.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    if session.get("status") != "completed":
-        raise HTTPException(status_code=400, detail="Session not completed. Please finalize the session first.")
-    
-    try:
-        report_data = session.get("final_report", {})
-        pdf_path = pdf_service.generate_summary_pdf(session, report_data)
-        
-        # Get filename from path
-        filename = os.path.basename(pdf_path)
-        
-        return FileResponse(
-            path=pdf_path,
-            filename=filename,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
+    session = await _completed_session(session_id)
+    return _not_modified(session_id, session, "summary", "pdf", if_none_match) or \
+        _pdf_response(*await _render_pdf(session_id, session, "summary"))
 
 @router.get("/session/{session_id}/export/full/base64")
-async def export_full_report_base64(session_id: str):
+async def export_full_report_base64(session_id: str, if_none_match: Optional[str] = Header(None)):
     """Export complete interview report as base64 encoded PDF."""
-    session = store.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    if session.get("status") != "completed":
-        raise HTTPException(status_code=400, detail="Session not completed. Please finalize the session first.")
-    
-    try:
-        report_data = session.get("final_report", {})
-        pdf_path = pdf_service.generate_interview_report_pdf(session, report_data)
-        
-        # Convert to base64
-        pdf_base64 = pdf_service.get_pdf_as_base64(pdf_path)
-        filename = os.path.basename(pdf_path)
-        
-        # Clean up the temporary file
-        try:
-            os.remove(pdf_path)
-        except OSError:
-            pass  # File cleanup is not critical
-        
-        return {
-            "filename": filename,
-            "pdf_data": pdf_base64,
-            "content_type": "application/pdf"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
+    session = await _completed_session(session_id)
+    return _not_modified(session_id, session, "report", "b64", if_none_match) or \
+        _base64_response(*await _render_pdf(session_id, session, "report"))
 
 @router.get("/session/{session_id}/export/summary/base64")
-async def export_summary_report_base64(session_id: str):
+async def export_summary_report_base64(session_id: str, if_none_match: Optional[str] = Header(None)):
     """Export interview summary as base64 encoded PDF."""
-    session = store.get(session_id)
+    session = await _completed_session(session_id)
+    return _not_modified(session_id, session, "summary", "b64", if_none_match) or \
+        _base64_response(*await _render_pdf(session_id, session, "summary"))
+
+# ------------------ BULK EXPORT ------------------
+
+BULK_EXPORT_MAX_SESSIONS = int(os.getenv("BULK_EXPORT_MAX_SESSIONS", "200"))
+BULK_EXPORT_CONCURRENCY = int(os.getenv("BULK_EXPORT_CONCURRENCY", str(max(render_pool.workers, 1))))
+BULK_EXPORT_RETRIES = 5
+# Filter mode can read any completed session, so it needs this admin token; unset keeps it off
+BULK_EXPORT_TOKEN = os.getenv("BULK_EXPORT_TOKEN", "")
+
+def _check_bulk_token(token: Optional[str]):
+    """Allow filter-mode bulk export only with the configured admin token."""
+    if not BULK_EXPORT_TOKEN:
+        raise HTTPException(status_code=403, detail="Filter export is disabled; pass session_ids")
+    if not token or not hmac.compare_digest(token.encode(), BULK_EXPORT_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Bulk-Export-Token")
+
+async def _bulk_render(session_id: str, kind: str):
+    """(session_id, pdf, error) for one archive entry; never raises."""
+    session = await store.aget(session_id)
     if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    if session.get("status") != "completed":
-        raise HTTPException(status_code=400, detail="Session not completed. Please finalize the session first.")
-    
-    try:
-        report_data = session.get("final_report", {})
-        pdf_path = pdf_service.generate_summary_pdf(session, report_data)
-        
-        # Convert to base64
-        pdf_base64 = pdf_service.get_pdf_as_base64(pdf_path)
-        filename = os.path.basename(pdf_path)
-        
-        # Clean up the temporary file
+        return session_id, None, "Session not found"
+    if session.status != "completed":
+        return session_id, None, "Session not completed"
+    for attempt in range(BULK_EXPORT_RETRIES):
         try:
-            os.remove(pdf_path)
-        except OSError:
-            pass  # File cleanup is not critical
-        
-        return {
-            "filename": filename,
-            "pdf_data": pdf_base64,
-            "content_type": "application/pdf"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
\ No newline at end of file
+            pdf, _ = await _render_cached(session_id, session, kind)
+            return session_id, pdf, None
+        except RenderOverloaded:
+            # Interactive exports share the pool; back off rather than fail the entry
+            await asyncio.sleep(0.5 * 2 ** attempt)
+        except Exception as e:
+            return session_id, None, f"Failed to generate PDF: {str(e)}"
+    return session_id, None, "PDF renderer is busy"
+
+async def _bulk_results(session_ids, kind: str):
+    """Yield _bulk_render results as they finish, with at most BULK_EXPORT_CONCURRENCY in flight."""
+    ids = iter(session_ids)
+    pending = set()
+    try:
+        while True:
+            for session_id in ids:
+                pending.add(asyncio.ensure_future(_bulk_render(session_id, kind)))
+                if len(pending) >= BULK_EXPORT_CONCURRENCY:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # Client went away mid-archive
+        for task in pending:
+            task.cancel()
+
+@router.post("/export/bulk")
+async def export_bulk(req: BulkExportRequest, x_bulk_export_token: Optional[str] = Header(None)):
+    """Export many completed sessions as one ZIP, streamed entry by entry as renders finish."""
+    limit = max(1, min(req.limit, BULK_EXPORT_MAX_SESSIONS))
+    if req.session_ids:
+        session_ids = list(dict.fromkeys(req.session_ids))
+        if len(session_ids) > limit:
+            raise HTTPException(status_code=400, detail=f"At most {limit} sessions per bulk export")
+    elif req.filter:
+        _check_bulk_token(x_bulk_export_token)
+        f = req.filter
+        session_ids = await store.afind_completed(
+            since=f.created_after, until=f.created_before, limit=limit,
+            role=f.role, domain=f.domain, experience=f.experience, mode=f.mode,
+        )
+    else:
+        raise HTTPException(status_code=400, detail="Provide session_ids or a filter")
+    if not session_ids:
+        raise HTTPException(status_code=404, detail="No completed sessions match")
+
+    async def archive():
+        zs = ZipStream()
+        manifest = {"kind": req.kind, "exported": [], "failed": []}
+        async for session_id, pdf, error in _bulk_results(session_ids, req.kind):
+            if error:
+                manifest["failed"].append({"session_id": session_id, "error": error})
+                continue
+            name = f"{session_id}_{req.kind}.pdf"
+            manifest["exported"].append({"session_id": session_id, "file": name})
+            yield zs.add(name, pdf)
+        yield zs.add("manifest.json", json.dumps(manifest, indent=2).encode("utf-8"), compress=True)
+        yield zs.close()
+
+    return StreamingResponse(
+        archive(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=interview_{req.kind}s.zip"},
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Literal
 
 class StartRequest(BaseModel):
     role: str
@@ -24,9 +24,26 @@ class AnswerRequest(BaseModel):
     question_id: int
     answer: str
 
+class BatchAnswerRequest(BaseModel):
+    answers: List[AnswerRequest]
+
 class EvalResponse(BaseModel):
     question_id: int
     scores: Dict[str,int]
     feedback: str
     examples_or_corrections: Optional[str] = None
     resources: Optional[List[str]] = None
+
+class BulkExportFilter(BaseModel):
+    role: Optional[str] = None
+    domain: Optional[str] = None
+    experience: Optional[str] = None
+    mode: Optional[str] = None
+    created_after: Optional[float] = None   # unix timestamp
+    created_before: Optional[float] = None
+
+class BulkExportRequest(BaseModel):
+    session_ids: Optional[List[str]] = None
+    filter: Optional[BulkExportFilter] = None
+    kind: Literal["report", "summary"] = "report"
+    limit: int = 100
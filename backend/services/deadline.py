@@ -0,0 +1,59 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Absolute time.monotonic() by which the current request must be answered
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None when no deadline is set."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def budget(default: float) -> float:
+    """Timeout for one call: `default`, shortened to what is left of the deadline."""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(default, left)
+
+
+def start(seconds: Optional[float]) -> contextvars.Token:
+    """Set a deadline `seconds` from now, never extending one already in force."""
+    at = _deadline.get()
+    if seconds is not None:
+        new = time.monotonic() + seconds
+        at = new if at is None else min(at, new)
+    return _deadline.set(at)
+
+
+def reset(token: contextvars.Token):
+    try:
+        _deadline.reset(token)
+    except ValueError:
+        # Token from another context (e.g. a dependency torn down elsewhere); nothing to undo here
+        pass
+
+
+@contextmanager
+def scope(seconds: Optional[float]):
+    token = start(seconds)
+    try:
+        yield
+    finally:
+        reset(token)
+
+
+def bind(fn, *args, **kwargs):
+    """Callable that runs `fn` in a copy of the current context, for executor threads."""
+    ctx = contextvars.copy_context()
+    return lambda: ctx.run(fn, *args, **kwargs)
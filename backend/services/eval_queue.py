@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+JobKey = Tuple[str, int]
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobRunning(Exception):
+    pass
+
+
+class EvaluationQueue:
+    """
+    In-process queue that runs answer evaluations in the background.
+
+    At most `concurrency` evaluations run at once per worker process, which
+    also caps concurrent LLM calls. Successful results are awaited through
+    `on_result(session_id, answer_obj)` (the session store); jobs are then
+    dropped, so only queued, running and recently failed jobs are kept.
+    Resubmitting a question whose job is still queued replaces its answer;
+    one whose job is already running is refused with JobRunning.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[..., Awaitable],
+        on_result: Callable[[str, dict], Awaitable],
+        concurrency: int = 4,
+        max_pending: int = 1000,
+        max_failed: int = 1000,
+    ):
+        self.evaluate = evaluate
+        self.on_result = on_result
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.max_failed = max_failed
+        self.jobs: Dict[JobKey, dict] = {}
+        self.failed: "OrderedDict[JobKey, dict]" = OrderedDict()
+        # Arguments of queued jobs, read when a worker picks the job up
+        self._payloads: Dict[JobKey, tuple] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(self, session_id: str, question: dict, answer: str, mode: str, experience: str,
+               api_key: Optional[str] = None, provider: str = "gemini") -> dict:
+        """Queue an evaluation and return its job record immediately."""
+        self.start()
+        key = (session_id, question["id"])
+        payload = (question, answer, mode, experience, api_key, provider)
+        job = self.jobs.get(key)
+        if job is not None:
+            if job["status"] != "queued":
+                raise JobRunning("An evaluation for this question is already running")
+            self._payloads[key] = payload
+            return job
+        if len(self.jobs) >= self.max_pending:
+            raise QueueFull("Evaluation queue is full")
+
+        self.failed.pop(key, None)
+        job = {"job_id": str(uuid4()), "question_id": question["id"], "status": "queued"}
+        self.jobs[key] = job
+        self._payloads[key] = payload
+        self._queue.put_nowait((key, job))
+        return job
+
+    def status(self, session_id: str, question_id: int) -> Optional[dict]:
+        key = (session_id, question_id)
+        return self.jobs.get(key) or self.failed.get(key)
+
+    def pending(self, session_id: str) -> bool:
+        return any(sid == session_id for sid, _ in self.jobs)
+
+    async def _worker(self):
+        while True:
+            key, job = await self._queue.get()
+            question, answer, mode, experience, api_key, provider = self._payloads.pop(key)
+            job["status"] = "running"
+            try:
+                res = await self.evaluate(question, answer, mode, experience, api_key=api_key, provider=provider)
+                if not isinstance(res, dict):
+                    raise ValueError("Unexpected evaluation result format")
+                if res.get("error"):
+                    raise ValueError(res["error"])
+                await self.on_result(key[0], {"question_id": key[1], "answer": answer, "evaluation": res})
+                self.jobs.pop(key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Background evaluation %s failed: %s", job["job_id"], e)
+                job.update(status="failed", error=str(e))
+                self.jobs.pop(key, None)
+                self.failed[key] = job
+                while len(self.failed) > self.max_failed:
+                    self.failed.popitem(last=False)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,115 @@
+import json
+import re
+from typing import List, Optional, Tuple
+
+_FEEDBACK_RE = re.compile(r'"feedback"\s*:\s*"')
+_SCORES_RE = re.compile(r'"scores"\s*:\s*\{')
+
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _string_end(buf: str, start: int) -> Tuple[int, bool]:
+    """
+    Scan a JSON string body starting at `start`.
+
+    Returns (end, closed): `end` is the index of the closing quote when
+    `closed`, otherwise the length of the longest prefix that holds no
+    partial escape sequence.
+    """
+    i = start
+    n = len(buf)
+    while i < n:
+        c = buf[i]
+        if c == '"':
+            return i, True
+        if c == "\\":
+            width = 6 if i + 1 < n and buf[i + 1] == "u" else 2
+            if i + width > n:
+                return i, False
+            i += width
+            continue
+        i += 1
+    return n, False
+
+
+def _decode(raw: str) -> str:
+    # Models often put raw newlines inside strings, so don't parse strictly
+    return json.loads(f'"{raw}"', strict=False)
+
+
+class EvalStreamParser:
+    """
+    Incrementally picks fields out of a streamed evaluation JSON object.
+
+    `feed` returns newly available events: `feedback_delta` while the
+    feedback string is still arriving, `feedback` once it is complete, and
+    `scores` as soon as the scores object closes. The full object is parsed
+    by the caller once the stream ends.
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self._feedback_start: Optional[int] = None
+        self._feedback_sent = 0
+        self._feedback_done = False
+        self._scores_done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, dict]]:
+        self.buf += chunk
+        events = []
+        if not self._feedback_done:
+            events.extend(self._scan_feedback())
+        if not self._scores_done:
+            events.extend(self._scan_scores())
+        return events
+
+    def _scan_feedback(self):
+        if self._feedback_start is None:
+            m = _FEEDBACK_RE.search(self.buf)
+            if not m:
+                return []
+            self._feedback_start = m.end()
+
+        end, closed = _string_end(self.buf, self._feedback_start)
+        try:
+            text = _decode(self.buf[self._feedback_start:end])
+        except ValueError:
+            return []
+
+        events = []
+        if len(text) > self._feedback_sent:
+            events.append(("feedback_delta", {"text": text[self._feedback_sent:]}))
+            self._feedback_sent = len(text)
+        if closed:
+            self._feedback_done = True
+            events.append(("feedback", {"feedback": text}))
+        return events
+
+    def _scan_scores(self):
+        m = _SCORES_RE.search(self.buf)
+        if not m:
+            return []
+        depth = 0
+        i = m.end() - 1
+        while i < len(self.buf):
+            c = self.buf[i]
+            if c == '"':
+                i, closed = _string_end(self.buf, i + 1)
+                if not closed:
+                    return []
+            elif c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        scores = json.loads(self.buf[m.end() - 1:i + 1])
+                    except ValueError:
+                        return []
+                    self._scores_done = True
+                    return [("scores", {"scores": scores})]
+            i += 1
+        return []
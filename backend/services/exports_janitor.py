@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ExportsJanitor:
+    """
+    Keeps the exports directory within an age and a total-size quota.
+
+    Files written by this process are recorded with `track`, so sweeps walk
+    an index ordered by write time instead of listing and stat-ing the whole
+    directory. The index is rebuilt from one `os.scandir` pass at start and
+    every `rescan_interval` seconds to pick up files from other workers or
+    deleted out from under us. Sweeps drop files older than `max_age`, then
+    the oldest files until the total is at most `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_age: Optional[float] = 24 * 3600, max_bytes: Optional[int] = None,
+                 interval: float = 300.0, rescan_interval: float = 3600.0, suffix: str = ".pdf"):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.rescan_interval = rescan_interval
+        self.suffix = suffix
+        # path -> (written_at, size), oldest first
+        self._index: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._last_scan: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"files_reclaimed": 0, "bytes_freed": 0, "sweeps": 0, "errors": 0}
+
+    def track(self, path: str, size: int, written_at: Optional[float] = None):
+        with self._lock:
+            self._forget(path)
+            self._index[path] = (written_at if written_at is not None else time.time(), size)
+            self._bytes += size
+
+    def _forget(self, path: str):
+        old = self._index.pop(path, None)
+        if old is not None:
+            self._bytes -= old[1]
+
+    def rescan(self):
+        """Rebuild the index from the directory."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(self.suffix):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, entry.path, st.st_size))
+        except OSError as e:
+            self.stats["errors"] += 1
+            logger.warning("Failed to scan exports directory %s: %s", self.directory, e)
+            return
+        entries.sort()
+        with self._lock:
+            self._index = OrderedDict((path, (mtime, size)) for mtime, path, size in entries)
+            self._bytes = sum(size for _, _, size in entries)
+        self._last_scan = time.monotonic()
+
+    def _victims(self, now: float):
+        with self._lock:
+            victims = []
+            remaining = self._bytes
+            for path, (written_at, size) in self._index.items():
+                expired = self.max_age is not None and now - written_at > self.max_age
+                over = self.max_bytes is not None and remaining > self.max_bytes
+                if not (expired or over):
+                    break
+                victims.append((path, size))
+                remaining -= size
+            return victims
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Delete files over quota; returns how many were reclaimed."""
+        if self._last_scan is None or time.monotonic() - self._last_scan >= self.rescan_interval:
+            self.rescan()
+        now = now if now is not None else time.time()
+        reclaimed = 0
+        for path, size in self._victims(now):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.stats["errors"] += 1
+                logger.warning("Failed to remove export %s: %s", path, e)
+                continue
+            else:
+                reclaimed += 1
+                self.stats["bytes_freed"] += size
+            with self._lock:
+                self._forget(path)
+        self.stats["files_reclaimed"] += reclaimed
+        self.stats["sweeps"] += 1
+        return reclaimed
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "files": len(self._index), "bytes": self._bytes}
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception:
+                logger.exception("Exports janitor sweep crashed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def build_exports_janitor(directory: str) -> ExportsJanitor:
+    """Create the janitor from EXPORTS_* env vars; 0 disables a quota."""
+    max_age = float(os.getenv("EXPORTS_MAX_AGE_HOURS", "24")) * 3600
+    max_bytes = int(os.getenv("EXPORTS_MAX_BYTES", str(512 * 1024 * 1024)))
+    return ExportsJanitor(
+        directory,
+        max_age=max_age or None,
+        max_bytes=max_bytes or None,
+        interval=float(os.getenv("EXPORTS_SWEEP_INTERVAL", "300")),
+        rescan_interval=float(os.getenv("EXPORTS_RESCAN_INTERVAL", "3600")),
+    )
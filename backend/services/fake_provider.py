@@ -0,0 +1,125 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+_QUESTIONS_RE = re.compile(r"Generate (\d+) interview questions")
+_QUESTION_ID_RE = re.compile(r'"question_id":\s*(\d+)')
+_BATCH_ID_RE = re.compile(r"^Question (\d+):", re.M)
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency sampler in seconds from a spec in milliseconds:
+
+    fixed:MS, uniform:LOW:HIGH, normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA.
+    """
+    kind, *args = (spec or "fixed:0").split(":")
+    args = [float(a) for a in args]
+    if kind == "fixed":
+        return lambda rng: args[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1])) / 1000
+    if kind == "lognormal":
+        return lambda rng: args[0] * rng.lognormvariate(0, args[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def fake_completion(prompt: str) -> str:
+    """Well-formed output for the prompts openai_service sends, derived only from the prompt."""
+    m = _QUESTIONS_RE.search(prompt)
+    if m:
+        return json.dumps([
+            {"id": i, "question": f"Fake question {i}: walk me through a design decision you made.",
+             "type": "technical", "difficulty": "medium", "hint": "Think about trade-offs."}
+            for i in range(1, int(m.group(1)) + 1)
+        ])
+
+    def evaluation(qid: int) -> dict:
+        return {
+            "question_id": qid,
+            "scores": {"technical": 5 + qid % 5, "communication": 6, "confidence": 7},
+            "feedback": "Clear structure. Quantify the impact. Mention the alternatives you rejected.",
+            "examples_or_corrections": "Situation, task, action, result with one concrete metric.",
+            "resources": ["https://example.com/interview-guide"],
+        }
+
+    batch_ids = [int(q) for q in _BATCH_ID_RE.findall(prompt)]
+    if batch_ids:
+        return json.dumps([evaluation(qid) for qid in batch_ids])
+    m = _QUESTION_ID_RE.search(prompt)
+    return json.dumps(evaluation(int(m.group(1)) if m else 0))
+
+
+class FakeServiceUnavailable(Exception):
+    """Injected failure, carrying a status code like the provider SDKs' errors."""
+
+    status_code = 503
+
+
+class FakeLLM:
+    """
+    Local stand-in for a chat-completions client, for benchmarks and offline runs.
+
+    Responses are valid JSON derived from the prompt; latency is drawn from
+    `latency` and `error_rate` of calls fail with a retryable 503. A seeded
+    generator makes a run's sequence of latencies and failures repeatable.
+    Honours the per-call `timeout` the way the real SDKs do.
+    """
+
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0, seed: Optional[int] = None,
+                 stream_chunks: int = 8):
+        self._sample = parse_latency(latency)
+        self.error_rate = error_rate
+        self.stream_chunks = stream_chunks
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _draw(self):
+        with self._lock:
+            return self._sample(self._rng), self._rng.random() < self.error_rate
+
+    def _wait(self, seconds: float, timeout: Optional[float]):
+        if timeout is not None and seconds > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Fake provider request timed out")
+        time.sleep(seconds)
+
+    def create(self, model=None, messages=None, temperature=None, max_tokens=None, timeout=None, stream=False):
+        latency, fail = self._draw()
+        prompt = messages[-1]["content"] if messages else ""
+        if fail:
+            self._wait(latency, timeout)
+            raise FakeServiceUnavailable("Service Unavailable (fake provider)")
+        text = fake_completion(prompt)
+        if not stream:
+            self._wait(latency, timeout)
+            message = SimpleNamespace(content=text)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        return self._stream(text, latency, timeout)
+
+    def _stream(self, text: str, latency: float, timeout: Optional[float]):
+        # First chunk after half the latency, the rest spread over the remainder
+        self._wait(latency / 2, timeout)
+        size = max(1, len(text) // self.stream_chunks)
+        for i in range(0, len(text), size):
+            if i:
+                time.sleep(latency / 2 / self.stream_chunks)
+            delta = SimpleNamespace(content=text[i:i + size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def build_fake_llm() -> FakeLLM:
+    seed = os.getenv("FAKE_LLM_SEED", "0")
+    return FakeLLM(
+        latency=os.getenv("FAKE_LLM_LATENCY", "lognormal:800:0.4"),
+        error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+        seed=int(seed) if seed else None,
+    )
@@ -0,0 +1,98 @@
+import json
+import re
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# Only these characters change the scanner's state; everything else is skipped by the regex engine
+_SPECIAL = re.compile(r'[{}\[\]"]')
+# Rest of a JSON string after its opening quote, escapes included
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_CLOSER = {"{": "}", "[": "]"}
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+# Cheap test that a span could be JSON at all, so bracketed prose like {this} skips the parser
+_JSON_START = re.compile(r'\{\s*["}]|\[\s*(?:[\]\[{"\d-]|true|false|null)')
+
+
+def balanced_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    (start, end) of every outermost bracket-balanced {...} or [...] in `text`.
+
+    One pass over the text, yielding each span as soon as nothing still
+    open could enclose it: string bodies are skipped whole, a mismatched
+    closer abandons everything still open, and a region that never closes
+    (e.g. truncated output) still yields the balanced values nested in it.
+    """
+    stack: List[int] = []
+    pending: List[Tuple[int, int]] = []  # closed spans an open bracket may still enclose
+    pos = 0
+    while True:
+        m = _SPECIAL.search(text, pos)
+        if m is None:
+            break
+        pos = m.end()
+        c = m.group()
+        if c == '"':
+            # Quotes in surrounding prose don't open strings
+            if stack:
+                tail = _STRING_TAIL.match(text, pos)
+                if tail is None:
+                    break  # unterminated string: nothing after it can close
+                pos = tail.end()
+        elif c == "{" or c == "[":
+            stack.append(pos - 1)
+        elif stack:
+            start = stack.pop()
+            if _CLOSER[text[start]] != c:
+                stack.clear()
+                yield from pending
+                pending.clear()
+                continue
+            # A span closing around earlier spans replaces them
+            while pending and pending[-1][0] > start:
+                pending.pop()
+            if stack:
+                pending.append((start, pos))
+            else:
+                yield start, pos
+    yield from pending
+
+
+def _loads(candidate: str):
+    if not _JSON_START.match(candidate):
+        return None
+    try:
+        return json.loads(candidate, strict=False)
+    except ValueError:
+        pass
+    # Trailing commas are the most common near-miss in model output
+    repaired = _TRAILING_COMMA.sub(r"\1", candidate)
+    if repaired != candidate:
+        try:
+            return json.loads(repaired, strict=False)
+        except ValueError:
+            pass
+    return None
+
+
+def iter_json(text: str) -> Iterator[Any]:
+    """Each JSON object or array embedded in `text` (code fences, prose around it), in order."""
+    for start, end in balanced_spans(text):
+        value = _loads(text[start:end])
+        if value is not None:
+            yield value
+
+
+def extract_json(text: str, accept: Optional[Callable[[Any], bool]] = None):
+    """
+    First embedded JSON value that `accept` takes, else the first one found.
+
+    Returns None when the text holds no parseable object or array. Runs in
+    time linear in the text: candidates never overlap, so each character is
+    scanned once and each candidate is parsed at most twice.
+    """
+    first = None
+    for value in iter_json(text):
+        if accept is None or accept(value):
+            return value
+        if first is None:
+            first = value
+    return first
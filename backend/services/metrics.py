@@ -0,0 +1,192 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (metric name, type, help, [(labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label tuple."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> Iterable[Family]:
+        with self._lock:
+            samples = [(dict(zip(self.labelnames, k)), v) for k, v in self._values.items()]
+        yield self.name, "counter", self.help, samples
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per label tuple.
+
+    `observe` is a bisect plus three additions under a lock, so it is cheap
+    enough for every request; buckets are only accumulated at scrape time.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self) -> Iterable[Family]:
+        with self._lock:
+            snapshot = [(k, list(s[0]), s[1], s[2]) for k, s in self._series.items()]
+        samples = []
+        for key, counts, total, count in snapshot:
+            base = dict(zip(self.labelnames, key))
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                samples.append(({**base, "le": _number(bound)}, running, "_bucket"))
+            samples.append((base, total, "_sum"))
+            samples.append((base, count, "_count"))
+        yield self.name, "histogram", self.help, samples
+
+
+class Registry:
+    """Metrics owned here plus collectors that read existing stats dicts at scrape time."""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, *args, **kwargs) -> Counter:
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collect: Callable[[], Iterable[Family]]):
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        families = [f for m in self._metrics for f in m.collect()]
+        for collect in self._collectors:
+            families.extend(collect())
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels, value = sample[0], sample[1]
+                suffix = sample[2] if len(sample) > 2 else ""
+                lines.append(f"{name}{suffix}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_request_seconds = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"))
+llm_call_seconds = REGISTRY.histogram(
+    "llm_call_duration_seconds", "Provider call latency, including retries.", ("provider", "model", "outcome"))
+llm_tokens = REGISTRY.counter(
+    "llm_tokens_total", "Tokens sent and received per provider and model.", ("provider", "model", "kind"))
+pdf_render_seconds = REGISTRY.histogram(
+    "pdf_render_duration_seconds", "PDF render time in the render pool.", ("kind",))
+
+
+def gauge(name: str, help: str, samples: List[Tuple[Dict[str, str], float]]) -> Family:
+    return name, "gauge", help, samples
+
+
+def counter(name: str, help: str, samples: List[Tuple[Dict[str, str], float]]) -> Family:
+    return name, "counter", help, samples
+
+
+def ratio(hits: float, misses: float) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each request into `http_request_seconds`.
+
+    Requests are labelled by route template (e.g. /interview/session/{session_id}),
+    not raw path, so session ids never become label values. Streaming
+    responses are timed until the last body chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_request_seconds.observe(time.perf_counter() - start, scope["method"], path, str(status))
+
+
+def observe_llm(provider: str, model: Optional[str], seconds: float, outcome: str,
+                prompt_tokens: int = 0, completion_tokens: int = 0):
+    model = model or ""
+    llm_call_seconds.observe(seconds, provider, model, outcome)
+    if prompt_tokens:
+        llm_tokens.inc(provider, model, "prompt", amount=prompt_tokens)
+    if completion_tokens:
+        llm_tokens.inc(provider, model, "completion", amount=completion_tokens)
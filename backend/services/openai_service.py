@@ -1,21 +1,26 @@
 import os
 import json
-import re
+import asyncio
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
 
-try:
-    from groq import Groq
-except ImportError:
-    Groq = None
-
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None
+from services import deadline
+from services.deadline import DeadlineExceeded
+from services.eval_stream import EvalStreamParser
+from services.fake_provider import build_fake_llm
+from services.json_extract import extract_json
+from services.metrics import observe_llm
+from services.provider_clients import ClientRegistry
+from services.provider_health import ProviderHealth
+from services.provider_sdks import SDKS, httpx as httpx_sdk
+from services.rate_limit import RateLimited, build_rate_limiter, estimate_tokens
+from services.tracing import span
+from pydantic import ValidationError
+from schemas import EvalResponse, Question
+from services.response_cache import MemoryTier, ResponseCache, SQLiteTier, cache_key
 
 # Load environment variables
 load_dotenv()
@@ -27,27 +32,205 @@ dotenv_path = os.path.join(BASE_DIR, "..", ".env")
 DEFAULT_MODELS = {
     "gemini": os.getenv("GEMINI_MODEL", "gemini-2.0-flash"),
     "openai": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-    "groq": os.getenv("GROQ_MODEL", "mixtral-8x7b")
+    "groq": os.getenv("GROQ_MODEL", "mixtral-8x7b"),
 }
 
+# Local stand-in for load tests (see fake_provider.py). It returns canned evaluations,
+# so it is only a selectable provider when explicitly switched on.
+FAKE_LLM_ENABLED = os.getenv("FAKE_LLM_ENABLED", "0") == "1"
+if FAKE_LLM_ENABLED:
+    DEFAULT_MODELS["fake"] = os.getenv("FAKE_MODEL", "fake-1")
 
-def safe_parse_json(text: str):
-    """Safely parse text into JSON or return fallback structure."""
-    text = text.strip()
-    try:
-        return json.loads(text)
-    except Exception:
-        match = re.search(r"(\{.*\}|\[.*\])", text, re.S)
-        if match:
-            try:
-                return json.loads(match.group(1))
-            except Exception:
-                pass
+# Provider SDKs are blocking, so async callers offload them onto a bounded pool.
+# Threads only wait on network I/O, which lets one worker keep many interviews in flight.
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "64"))
+_llm_executor = ThreadPoolExecutor(max_workers=LLM_MAX_WORKERS, thread_name_prefix="llm")
+
+# Upper bound for a single provider call; a request deadline can only shorten it
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "30"))
+# Transient failures are retried up to LLM_RETRIES times with capped, jittered backoff
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+LLM_RETRY_BASE = float(os.getenv("LLM_RETRY_BASE", "0.5"))
+LLM_RETRY_MAX = float(os.getenv("LLM_RETRY_MAX", "4.0"))
+
+call_stats = defaultdict(lambda: {"calls": 0, "retries": 0, "timeouts": 0, "deadline_exceeded": 0, "errors": 0})
+
+# Connection pool limits for each cached OpenAI/Groq client
+LLM_POOL_CONNECTIONS = int(os.getenv("LLM_POOL_CONNECTIONS", "20"))
+LLM_POOL_KEEPALIVE = int(os.getenv("LLM_POOL_KEEPALIVE", "10"))
+
+
+def _http_client():
+    if not httpx_sdk.available():
+        return None
+    httpx = httpx_sdk.load()
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_POOL_CONNECTIONS,
+            max_keepalive_connections=LLM_POOL_KEEPALIVE,
+        )
+    )
+
+
+def _build_client(provider: str, api_key: str, model: str):
+    """Construct a provider client; called only on a registry miss. SDKs are imported here on first use."""
+    if provider == "gemini":
+        genai = SDKS["gemini"].load()
+        from google.ai import generativelanguage as glm
+        from google.api_core import client_options
+
+        # genai.configure() swaps a process-wide default, which is unsafe with per-user
+        # keys on concurrent threads; pin a dedicated service client to the model instead.
+        llm = genai.GenerativeModel(model)
+        llm._client = glm.GenerativeServiceClient(
+            client_options=client_options.ClientOptions(api_key=api_key)
+        )
+        return llm
+
+    elif provider in ("groq", "openai"):
+        return SDKS[provider].load()(api_key=api_key, http_client=_http_client())
+
+    elif provider == "fake" and FAKE_LLM_ENABLED:
+        return build_fake_llm()
+
+    raise ValueError(f"❌ Unsupported provider: {provider}")
+
+
+clients = ClientRegistry(
+    _build_client,
+    max_size=int(os.getenv("LLM_CLIENT_CACHE_SIZE", "32")),
+    idle_ttl=float(os.getenv("LLM_CLIENT_IDLE_TTL", "600")),
+)
+
+
+def _build_question_cache():
+    if os.getenv("QUESTION_CACHE_ENABLED", "1") != "1":
+        return None
+    tiers = [MemoryTier(max_entries=int(os.getenv("QUESTION_CACHE_SIZE", "512")))]
+    db_path = os.getenv("QUESTION_CACHE_DB")
+    if db_path:
+        tiers.append(SQLiteTier(db_path))
+    return ResponseCache(
+        tiers,
+        ttl=float(os.getenv("QUESTION_CACHE_TTL", "86400")),
+        variants=int(os.getenv("QUESTION_CACHE_VARIANTS", "3")),
+    )
+
+
+# Question prompts repeat for the handful of role/experience/mode combos the UI offers
+question_cache = _build_question_cache()
+
+
+def safe_parse_json(text: str, accept=None):
+    """
+    Parse model output as JSON, or return {"raw": text} when it holds none.
+
+    Output wrapped in code fences or prose is searched for embedded objects
+    and arrays; `accept` picks the one shaped like what the caller expects.
+    """
+    with span("parse_json", chars=len(text)) as s:
+        text = text.strip()
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+        parsed = extract_json(text, accept)
+        if parsed is not None:
+            s.set(path="extracted")
+            return parsed
+        s.set(path="raw")
         return {"raw": text}
 
 
+# HTTP statuses worth retrying: request timeout, throttling and server-side failures
+_TRANSIENT_STATUS = {408, 429, 500, 502, 503, 504}
+# Exception classes (or their bases) the SDKs raise for the same conditions without a status:
+# openai/groq APIConnectionError, httpx TransportError, google.api_core ServiceUnavailable...
+_TRANSIENT_TYPES = ("Connection", "Transport", "RateLimit", "ResourceExhausted", "ServiceUnavailable",
+                    "InternalServer", "TooManyRequests")
+
+
+def _error_types(error: Exception):
+    return [cls.__name__ for cls in type(error).__mro__]
+
+
+def _status_code(error: Exception):
+    """HTTP status carried by a provider SDK exception, or None."""
+    # openai/groq APIStatusError.status_code, google.api_core GoogleAPICallError.code
+    for attr in ("status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    value = getattr(getattr(error, "response", None), "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _is_timeout(error: Exception) -> bool:
+    return isinstance(error, TimeoutError) or any(
+        "Timeout" in name or "DeadlineExceeded" in name for name in _error_types(error))
+
+
+def _is_transient(error: Exception) -> bool:
+    """Failures worth retrying: timeouts, throttling, 5xx and dropped connections."""
+    if _is_timeout(error):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in _TRANSIENT_STATUS
+    return isinstance(error, ConnectionError) or any(
+        m in name for name in _error_types(error) for m in _TRANSIENT_TYPES)
+
+
+def _usage(resp):
+    """(prompt, completion) token counts reported by the provider, or (0, 0)."""
+    meta = getattr(resp, "usage_metadata", None)  # Gemini
+    if meta is not None:
+        return getattr(meta, "prompt_token_count", 0) or 0, getattr(meta, "candidates_token_count", 0) or 0
+    usage = getattr(resp, "usage", None)  # OpenAI / Groq
+    if usage is not None:
+        return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+    return 0, 0
+
+
+def _with_retries(provider: str, call):
+    """
+    Run an idempotent provider call, retrying transient failures.
+
+    Backoff is exponential from LLM_RETRY_BASE, capped at LLM_RETRY_MAX, with
+    full jitter; no retry is started that would overrun the request deadline.
+    """
+    stats = call_stats[provider]
+    for attempt in range(LLM_RETRIES + 1):
+        stats["calls"] += 1
+        try:
+            return call()
+        except DeadlineExceeded:
+            stats["deadline_exceeded"] += 1
+            raise
+        except Exception as e:
+            if _is_timeout(e):
+                stats["timeouts"] += 1
+            delay = random.uniform(0, min(LLM_RETRY_MAX, LLM_RETRY_BASE * 2 ** attempt))
+            left = deadline.remaining()
+            if attempt == LLM_RETRIES or not _is_transient(e) or (left is not None and delay >= left):
+                stats["errors"] += 1
+                raise
+            stats["retries"] += 1
+            time.sleep(delay)
+
+
+def _error_json(provider: str, error: Exception) -> str:
+    """Error payload for a failed call; deadline and timeout failures carry `"timeout": true`."""
+    body = {"error": handle_api_error(provider, error)[0]}
+    if isinstance(error, DeadlineExceeded) or _is_timeout(error):
+        body["timeout"] = True
+    return json.dumps(body)
+
+
 def handle_api_error(provider: str, error: Exception):
     """Detect API key, quota, or model issues and return friendly messages."""
+    if isinstance(error, DeadlineExceeded) or _is_timeout(error):
+        return f"⏱️ {provider.title()} did not respond in time.", False
     err = str(error).lower()
 
     key_related = [
@@ -67,101 +250,448 @@ def handle_api_error(provider: str, error: Exception):
         return f"❗ Unexpected error with {provider.title()} API: {error}", False
 
 
+# Client-side requests/min and tokens/min per provider and per key; see rate_limit.py
+rate_limiter = build_rate_limiter()
+
+
+def _env_key(provider: str):
+    """Server-side key from .env; the fake provider, when enabled, needs none."""
+    return os.getenv(f"{provider.upper()}_API_KEY") or ("fake" if provider == "fake" and FAKE_LLM_ENABLED else None)
+
+
+def has_server_key(provider: str) -> bool:
+    """Whether `provider` can be called on the server's own .env key."""
+    return bool(_env_key((provider or "").lower().strip()))
+
+
+def _limit_key(api_key: str = None):
+    """User key a request is sent with first, or None when it goes out on the server's .env key."""
+    return (api_key.strip() if api_key else None) or None
+
+
 def _generate_response(
     prompt: str,
     max_new_tokens: int = 600,
     temperature: float = 0.2,
     provider: str = "gemini",
     api_key: str = None,
-    model: str = None
+    model: str = None,
+    limit: bool = True,
+    outcome: dict = None
 ):
     """
     Unified dynamic LLM API router with fallback key logic:
     1️⃣ Try user-provided key (if any)
     2️⃣ On key-related error, retry with .env key
     3️⃣ Only fail if both are invalid or missing
+
+    With `limit`, blocks until the rate limiter admits the request; async
+    callers wait on the limiter themselves and pass `limit=False`. When an
+    error is returned, `outcome["provider_fault"]` tells whether it came
+    from the provider being unhealthy (timeouts, throttling, 5xx, dropped
+    connections) rather than from a key or configuration problem.
     """
     provider = provider.lower().strip()
     model = model or DEFAULT_MODELS.get(provider)
+    outcome = {} if outcome is None else outcome
+    outcome["provider_fault"] = False
+
+    def fail(error: Exception):
+        # The request's own deadline running out says nothing about the provider
+        outcome["provider_fault"] = not isinstance(error, DeadlineExceeded) and _is_transient(error)
+        return _error_json(provider, error)
+
+    if provider not in DEFAULT_MODELS:
+        return json.dumps({"error": f"❌ Unsupported provider: {provider}"})
 
     user_key = api_key.strip() if api_key else None
-    env_key = os.getenv(f"{provider.upper()}_API_KEY")
+    env_key = _env_key(provider)
 
     if not (user_key or env_key):
         return json.dumps({
             "error": f"❌ No API key provided for {provider.title()}. Please add one manually or in .env"
         })
 
+    if limit:
+        try:
+            rate_limiter.acquire_sync(provider, user_key, estimate_tokens(prompt, max_new_tokens),
+                                      deadline.remaining())
+        except RateLimited as e:
+            return json.dumps({"error": str(e)})
+        except DeadlineExceeded as e:
+            return fail(e)
+
     def call_provider(final_key):
-        if provider == "gemini":
-            if not genai:
-                raise ImportError("google-generativeai not installed. Run: pip install google-generativeai")
-            genai.configure(api_key=final_key)
-            llm = genai.GenerativeModel(model)
-            resp = llm.generate_content(
-                prompt,
-                generation_config={"temperature": temperature, "max_output_tokens": max_new_tokens},
-            )
-            return resp.text.strip() if resp and getattr(resp, "text", None) else ""
+        if provider not in DEFAULT_MODELS:
+            raise ValueError(f"❌ Unsupported provider: {provider}")
+        client = clients.get(provider, final_key, model)
 
-        elif provider == "groq":
-            if not Groq:
-                raise ImportError("groq package not installed. Run: pip install groq")
-            client = Groq(api_key=final_key)
-            resp = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=max_new_tokens,
-            )
-            return resp.choices[0].message.content.strip()
+        usage = [0, 0]
+
+        def once():
+            timeout = deadline.budget(LLM_CALL_TIMEOUT)
+            if provider == "gemini":
+                resp = client.generate_content(
+                    prompt,
+                    generation_config={"temperature": temperature, "max_output_tokens": max_new_tokens},
+                    request_options={"timeout": timeout},
+                )
+                usage[:] = _usage(resp)
+                return resp.text.strip() if resp and getattr(resp, "text", None) else ""
 
-        elif provider == "openai":
-            if not OpenAI:
-                raise ImportError("openai package not installed. Run: pip install openai")
-            client = OpenAI(api_key=final_key)
             resp = client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=temperature,
                 max_tokens=max_new_tokens,
+                timeout=timeout,
             )
+            usage[:] = _usage(resp)
             return resp.choices[0].message.content.strip()
 
-        else:
-            raise ValueError(f"❌ Unsupported provider: {provider}")
+        started = time.perf_counter()
+        try:
+            with span("llm.call", provider=provider, model=model) as s:
+                text = _with_retries(provider, once)
+                # Providers that don't report usage get the same chars/4 estimate the rate limiter uses
+                tokens = usage[0] or len(prompt) // 4, usage[1] or len(text) // 4
+                s.set(prompt_tokens=tokens[0], completion_tokens=tokens[1])
+            observe_llm(provider, model, time.perf_counter() - started, "ok", *tokens)
+            return text
+        except Exception as e:
+            observe_llm(provider, model, time.perf_counter() - started, "error")
+            # Don't keep a client around for a key the provider just rejected
+            if handle_api_error(provider, e)[1]:
+                clients.discard(provider, final_key, model)
+            raise
 
     # Try user key first
     if user_key:
         try:
             return call_provider(user_key)
         except Exception as e:
-            msg, key_error = handle_api_error(provider, e)
             # Retry with env key only for key-related errors
-            if key_error and env_key:
+            if handle_api_error(provider, e)[1] and env_key:
                 try:
                     return call_provider(env_key)
                 except Exception as e2:
-                    msg2, _ = handle_api_error(provider, e2)
-                    return json.dumps({"error": msg2})
-            return json.dumps({"error": msg})
+                    return fail(e2)
+            return fail(e)
 
     # If no user key, try env key directly
     try:
         return call_provider(env_key)
     except Exception as e:
-        msg, _ = handle_api_error(provider, e)
-        return json.dumps({"error": msg})
+        return fail(e)
+
+
+# ------------------ WARM-UP ------------------
+
+# Providers to load at startup instead of on their first request: a comma-separated
+# list, "configured" for every provider with a key in .env, or empty to stay lazy
+LLM_WARMUP = os.getenv("LLM_WARMUP", "")
+
+
+def warm_up(spec: str = None) -> dict:
+    """
+    Import provider SDKs and build their .env-key clients ahead of traffic.
+
+    Returns seconds spent per provider, or the error that stopped it; a
+    failed warm-up only means the first request pays for the import.
+    """
+    spec = LLM_WARMUP if spec is None else spec
+    if spec.strip() == "configured":
+        providers = [p for p in SDKS if _env_key(p)]
+    else:
+        providers = [p.strip().lower() for p in spec.split(",") if p.strip()]
+
+    timings = {}
+    for provider in providers:
+        started = time.perf_counter()
+        try:
+            key = _env_key(provider)
+            if key:
+                clients.get(provider, key, DEFAULT_MODELS[provider])
+            elif provider in SDKS:
+                SDKS[provider].load()
+            timings[provider] = round(time.perf_counter() - started, 3)
+        except Exception as e:
+            timings[provider] = f"{type(e).__name__}: {e}"
+    return timings
+
+
+# ------------------ ROUTING ------------------
+
+# Providers tried after the session's own one, using their .env keys
+LLM_FAILOVER = os.getenv("LLM_FAILOVER", "1") == "1"
+LLM_FAILOVER_ORDER = [p.strip().lower() for p in os.getenv("LLM_FAILOVER_ORDER", "gemini,groq,openai").split(",") if p.strip()]
+# Seconds before an attempt counts as failed and the next provider is tried
+LLM_ATTEMPT_TIMEOUT = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "30"))
+# Hedging fires the next provider once the first has run past its p95 latency
+LLM_HEDGE = os.getenv("LLM_HEDGE", "0") == "1"
+LLM_HEDGE_DELAY = float(os.getenv("LLM_HEDGE_DELAY", "3.0"))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+
+health = ProviderHealth(
+    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+    cooldown=float(os.getenv("LLM_BREAKER_COOLDOWN", "30")),
+)
+routing_stats = {"failovers": 0, "hedges": 0, "hedge_wins": 0}
+
+
+def _route_plan(provider: str, api_key: str = None, failover: bool = True):
+    """(provider, api_key) attempts in order; a user's key is only ever sent to their own provider."""
+    plan = [(provider, api_key)]
+    # An unknown or disabled provider (e.g. "fake" without FAKE_LLM_ENABLED) is refused, not
+    # quietly served by another vendor on the server's keys
+    if provider not in DEFAULT_MODELS:
+        return plan
+    if LLM_FAILOVER and failover:
+        plan += [(p, None) for p in LLM_FAILOVER_ORDER
+                 if p != provider and p in DEFAULT_MODELS and os.getenv(f"{p.upper()}_API_KEY")]
+    healthy = [a for a in plan if health.available(a[0])]
+    return healthy or plan[:1]
+
+
+def _hedge_delay(provider: str) -> float:
+    return max(LLM_HEDGE_MIN_DELAY, health.p95(provider) or LLM_HEDGE_DELAY)
+
+
+async def _alimit(prompt: str, max_new_tokens: int = 600, provider: str = "gemini", api_key: str = None, **_):
+    """
+    Wait on the event loop until the rate limiter admits the request; raises
+    RateLimited, or DeadlineExceeded when the wait would outlast the deadline.
+    """
+    provider = provider.lower().strip()
+    with span("llm.rate_limit", provider=provider):
+        await rate_limiter.acquire(provider, _limit_key(api_key), estimate_tokens(prompt, max_new_tokens),
+                                   deadline.remaining())
+
+
+def _unlimit(prompt: str, max_new_tokens: int = 600, provider: str = "gemini", api_key: str = None, **_):
+    """Give back what `_alimit` reserved, for a request that was never sent."""
+    rate_limiter.refund(provider.lower().strip(), _limit_key(api_key), estimate_tokens(prompt, max_new_tokens))
+
+
+async def _attempt(prompt: str, provider: str, api_key: str, kwargs: dict):
+    """One routed call; returns (text, valid) and feeds the provider's circuit breaker."""
+    with span("llm.attempt", provider=provider) as s:
+        text, valid = await _attempt_call(prompt, provider, api_key, kwargs)
+        s.set(valid=valid)
+        return text, valid
+
+
+def _generate_within(expires_at: float, prompt: str, **kwargs):
+    """
+    `_generate_response` under the attempt's own deadline (a time.monotonic()
+    value), so a thread whose attempt has timed out stops retrying instead
+    of calling the provider again after the router has moved on.
+    """
+    with deadline.scope(max(0.0, expires_at - time.monotonic())):
+        return _generate_response(prompt, **kwargs)
+
+
+async def _attempt_call(prompt: str, provider: str, api_key: str, kwargs: dict):
+    try:
+        await _alimit(prompt, provider=provider, api_key=api_key, **kwargs)
+    except RateLimited as e:
+        # Our own limiter says nothing about the provider's health
+        return json.dumps({"error": str(e)}), False
+    except DeadlineExceeded as e:
+        call_stats[provider]["deadline_exceeded"] += 1
+        return _error_json(provider, e), False
+
+    try:
+        timeout = deadline.budget(LLM_ATTEMPT_TIMEOUT)
+    except DeadlineExceeded as e:
+        _unlimit(prompt, provider=provider, api_key=api_key, **kwargs)
+        call_stats[provider]["deadline_exceeded"] += 1
+        return _error_json(provider, e), False
+
+    permit = health.acquire(provider)
+    if permit is None:
+        _unlimit(prompt, provider=provider, api_key=api_key, **kwargs)
+        return json.dumps({"error": f"⚠️ {provider.title()} is temporarily unavailable."}), False
+
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    outcome = {}
+    # Executor threads don't inherit contextvars, so carry the deadline and trace over explicitly
+    call = loop.run_in_executor(
+        _llm_executor,
+        deadline.bind(_generate_within, started + timeout, prompt, provider=provider, api_key=api_key, limit=False,
+                      outcome=outcome, **kwargs),
+    )
+    try:
+        text = await asyncio.wait_for(call, timeout)
+    except asyncio.TimeoutError:
+        call_stats[provider]["timeouts"] += 1
+        health.record_failure(provider)
+        return _error_json(provider, TimeoutError()), False
+    except BaseException:
+        # Cancelled, e.g. a hedge that lost: free a half-open probe slot
+        health.release(provider, permit)
+        raise
+
+    parsed = safe_parse_json(text)
+    if isinstance(parsed, dict) and "error" in parsed:
+        # Missing or rejected keys and unsupported providers are not outages
+        if outcome.get("provider_fault"):
+            health.record_failure(provider)
+        else:
+            health.release(provider, permit)
+        return text, False
+    health.record_success(provider, time.monotonic() - started)
+    return text, not (isinstance(parsed, dict) and "raw" in parsed)
+
+
+async def _agenerate_response(prompt: str, provider: str = "gemini", api_key: str = None, failover: bool = True,
+                              **kwargs):
+    """
+    Async, routed counterpart of `_generate_response` that never blocks the event loop.
+
+    Tries the session's provider first and fails over along
+    LLM_FAILOVER_ORDER on errors, timeouts or unparseable output, skipping
+    providers whose circuit is open. With LLM_HEDGE, a second provider is
+    started once the first has been running for its p95 latency, and the
+    first valid JSON result wins. If nothing succeeds, the primary's own
+    result (error or raw text) is returned so callers behave as before.
+    `failover=False` keeps the call on `provider` alone.
+    """
+    provider = provider.lower().strip()
+    plan = _route_plan(provider, api_key, failover)
+    pending = set()
+    providers = {}
+    next_attempt = 0
+    hedged = False
+    first = None
+
+    def launch():
+        nonlocal next_attempt
+        p, key = plan[next_attempt]
+        next_attempt += 1
+        task = asyncio.ensure_future(_attempt(prompt, p, key, kwargs))
+        providers[task] = p
+        pending.add(task)
+
+    with span("llm.route", provider=provider) as route:
+        launch()
+        try:
+            while pending:
+                can_hedge = LLM_HEDGE and not hedged and len(pending) == 1 and next_attempt < len(plan)
+                done, pending = await asyncio.wait(
+                    pending, timeout=_hedge_delay(plan[0][0]) if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = True
+                    routing_stats["hedges"] += 1
+                    launch()
+                    continue
+                for task in done:
+                    text, valid = task.result()
+                    if valid:
+                        if providers[task] != plan[0][0]:
+                            routing_stats["hedge_wins" if hedged else "failovers"] += 1
+                        route.set(served_by=providers[task], attempts=next_attempt, hedged=hedged)
+                        return text
+                    if providers[task] == provider or first is None:
+                        first = text
+                if not pending and next_attempt < len(plan):
+                    launch()
+            return first
+        finally:
+            # The losing call's thread finishes in the background; its result is ignored
+            for task in pending:
+                task.cancel()
+
+
+def _stream_response(
+    prompt: str,
+    max_new_tokens: int = 600,
+    temperature: float = 0.2,
+    provider: str = "gemini",
+    api_key: str = None,
+    model: str = None,
+    limit: bool = True
+):
+    """
+    Streaming counterpart of `_generate_response` that yields text chunks.
+
+    Uses the same user-key → .env-key fallback, but only until the first chunk
+    has been sent. Failures raise RuntimeError carrying the friendly message.
+    """
+    provider = provider.lower().strip()
+    model = model or DEFAULT_MODELS.get(provider)
+    if provider not in DEFAULT_MODELS:
+        raise RuntimeError(f"❌ Unsupported provider: {provider}")
+
+    user_key = api_key.strip() if api_key else None
+    env_key = _env_key(provider)
+    keys = [k for k in (user_key, env_key) if k]
+    if not keys:
+        raise RuntimeError(f"❌ No API key provided for {provider.title()}. Please add one manually or in .env")
+    if limit:
+        try:
+            rate_limiter.acquire_sync(provider, user_key, estimate_tokens(prompt, max_new_tokens),
+                                      deadline.remaining())
+        except RateLimited as e:
+            raise RuntimeError(str(e)) from e
+        except DeadlineExceeded as e:
+            raise RuntimeError(handle_api_error(provider, e)[0]) from e
+
+    def open_stream(final_key):
+        client = clients.get(provider, final_key, model)
+        timeout = deadline.budget(LLM_CALL_TIMEOUT)
+        if provider == "gemini":
+            resp = client.generate_content(
+                prompt,
+                generation_config={"temperature": temperature, "max_output_tokens": max_new_tokens},
+                stream=True,
+                request_options={"timeout": timeout},
+            )
+            return (chunk.text for chunk in resp if getattr(chunk, "parts", None))
+
+        stream = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_new_tokens,
+            stream=True,
+            timeout=timeout,
+        )
+        return (chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+
+    for final_key in keys:
+        started = False
+        t0 = time.perf_counter()
+        chars = 0
+        try:
+            with span("llm.stream", provider=provider, model=model) as s:
+                for chunk in open_stream(final_key):
+                    if chunk:
+                        if not started:
+                            s.set(first_chunk_ms=round((time.perf_counter() - t0) * 1000, 3))
+                        started = True
+                        chars += len(chunk)
+                        yield chunk
+            observe_llm(provider, model, time.perf_counter() - t0, "ok", len(prompt) // 4, chars // 4)
+            return
+        except Exception as e:
+            observe_llm(provider, model, time.perf_counter() - t0, "error")
+            msg, key_error = handle_api_error(provider, e)
+            if key_error:
+                clients.discard(provider, final_key, model)
+            # Retry with env key only for key-related errors before any output
+            if started or not key_error or final_key != user_key or not env_key:
+                raise RuntimeError(msg) from e
 
 
 # ------------------ GENERATE QUESTIONS ------------------
 
-def generate_questions(role, domain, experience, mode, num=4, api_key=None, provider="gemini"):
-    """Generate structured interview questions dynamically."""
-    role = role or "Software Engineer"
+def _questions_prompt(role, domain, experience, mode, num):
     domain_clause = f"in domain {domain}" if domain else ""
-
-    prompt = f"""
+    return f"""
 You are an experienced interviewer. Output valid JSON only.
 
 Generate {num} interview questions for a {mode} interview for a candidate applying to role "{role}" {domain_clause} with experience level "{experience}".
@@ -173,15 +703,39 @@ Return a JSON array like:
 ]
 """
 
-    text = _generate_response(prompt, max_new_tokens=600, provider=provider, api_key=api_key)
-    parsed = safe_parse_json(text)
+
+def _is_question_list(value):
+    return isinstance(value, list) and any(isinstance(q, dict) and "question" in q for q in value)
+
+
+def _valid_questions(parsed):
+    """Items of `parsed` that satisfy the Question schema; ids default to their position."""
+    if isinstance(parsed, dict):
+        parsed = parsed.get("questions")
+    questions = []
+    for i, raw in enumerate(parsed if isinstance(parsed, list) else [], 1):
+        if not isinstance(raw, dict):
+            continue
+        try:
+            q = Question(**{"id": i, **raw})
+        except ValidationError:
+            continue
+        if q.question.strip():
+            questions.append(q.dict())
+    return questions
+
+
+def _parse_questions(text, role, mode, num):
+    """Return (questions, cacheable); fallbacks and errors are never cached."""
+    parsed = safe_parse_json(text, accept=_is_question_list)
 
     # Handle provider or API errors
     if isinstance(parsed, dict) and "error" in parsed:
-        return parsed
+        return parsed, False
 
+    questions = _valid_questions(parsed)
     # Fallback if model output is invalid
-    if isinstance(parsed, dict) and "raw" in parsed:
+    if not questions:
         return [
             {
                 "id": i,
@@ -191,18 +745,82 @@ Return a JSON array like:
                 "hint": "",
             }
             for i in range(1, num + 1)
-        ]
-    return parsed
+        ], False
+    return questions, True
+
+
+def _question_cache_key(prompt, provider):
+    provider = (provider or "gemini").lower().strip()
+    return cache_key(prompt, provider, DEFAULT_MODELS.get(provider))
+
+
+def _cached_questions(key):
+    if question_cache is None:
+        return None
+    cached = question_cache.get(key)
+    return json.loads(cached) if cached is not None else None
+
+
+def _store_questions(key, questions, cacheable):
+    if question_cache is not None and cacheable:
+        question_cache.add(key, json.dumps(questions, sort_keys=True))
+
+
+def generate_questions(role, domain, experience, mode, num=4, api_key=None, provider="gemini",
+                       use_cache=True, fallback=True):
+    """
+    Generate structured interview questions dynamically.
+
+    With `fallback=False`, unparseable model output is reported as an error
+    instead of being replaced by generic placeholder questions.
+    """
+    role = role or "Software Engineer"
+    prompt = _questions_prompt(role, domain, experience, mode, num)
+    key = _question_cache_key(prompt, provider)
+    if use_cache:
+        cached = _cached_questions(key)
+        if cached is not None:
+            return cached
+
+    text = _generate_response(prompt, max_new_tokens=600, provider=provider, api_key=api_key)
+    questions, cacheable = _parse_questions(text, role, mode, num)
+    if not fallback and isinstance(questions, list) and not cacheable:
+        return {"error": "Model returned invalid question JSON"}
+    _store_questions(key, questions, cacheable)
+    return questions
+
+
+async def agenerate_questions(role, domain, experience, mode, num=4, api_key=None, provider="gemini",
+                              use_cache=True, fallback=True, failover=True):
+    """
+    Async variant of `generate_questions` for use inside request handlers.
+
+    With `failover=False`, questions only ever come from `provider`'s model.
+    """
+    role = role or "Software Engineer"
+    prompt = _questions_prompt(role, domain, experience, mode, num)
+    key = _question_cache_key(prompt, provider)
+    if use_cache:
+        cached = _cached_questions(key)
+        if cached is not None:
+            return cached
+
+    text = await _agenerate_response(prompt, max_new_tokens=600, provider=provider, api_key=api_key,
+                                     failover=failover)
+    questions, cacheable = _parse_questions(text, role, mode, num)
+    if not fallback and isinstance(questions, list) and not cacheable:
+        return {"error": "Model returned invalid question JSON"}
+    _store_questions(key, questions, cacheable)
+    return questions
 
 
 # ------------------ EVALUATE ANSWER ------------------
 
-def evaluate_answer(question_obj, answer_text, mode, experience, api_key=None, provider="gemini"):
-    """Evaluate a candidate's answer with structured scoring + feedback."""
+def _evaluation_prompt(question_obj, answer_text, mode, experience):
     qid = question_obj.get("id", 0)
     question = question_obj.get("question", "")
 
-    prompt = f"""
+    return f"""
 You are an expert interviewer & coach. Evaluate the candidate's answer.
 
 Question: "{question}"
@@ -230,18 +848,205 @@ Return JSON only like:
 }}
 """
 
+
+def _is_evaluation(value):
+    return isinstance(value, dict) and "scores" in value
+
+
+def _parse_evaluation(text, qid):
+    parsed = safe_parse_json(text, accept=_is_evaluation)
+
+    if isinstance(parsed, dict) and "error" in parsed:
+        return parsed
+
+    feedback = text
+    if isinstance(parsed, dict):
+        scores = parsed.get("scores")
+        if isinstance(scores, dict):
+            # Models sometimes give half points; the schema stores whole ones
+            parsed["scores"] = {k: round(v) if isinstance(v, float) else v for k, v in scores.items()}
+        try:
+            return EvalResponse(**{"question_id": qid, **parsed}).dict()
+        except (ValidationError, TypeError):
+            # Keep whatever prose the model gave when the scores don't validate
+            feedback = parsed.get("raw") or parsed.get("feedback") or text
+    return {
+        "question_id": qid,
+        "scores": {"technical": 5, "communication": 5, "confidence": 5},
+        "feedback": str(feedback),
+        "examples_or_corrections": "",
+        "resources": [],
+    }
+
+
+def evaluate_answer(question_obj, answer_text, mode, experience, api_key=None, provider="gemini"):
+    """Evaluate a candidate's answer with structured scoring + feedback."""
+    with span("prompt.build"):
+        prompt = _evaluation_prompt(question_obj, answer_text, mode, experience)
     text = _generate_response(prompt, max_new_tokens=700, provider=provider, api_key=api_key)
-    parsed = safe_parse_json(text)
+    return _parse_evaluation(text, question_obj.get("id", 0))
+
+
+async def aevaluate_answer(question_obj, answer_text, mode, experience, api_key=None, provider="gemini"):
+    """Async variant of `evaluate_answer` for use inside request handlers."""
+    with span("prompt.build"):
+        prompt = _evaluation_prompt(question_obj, answer_text, mode, experience)
+    text = await _agenerate_response(prompt, max_new_tokens=700, provider=provider, api_key=api_key)
+    return _parse_evaluation(text, question_obj.get("id", 0))
+
+
+def stream_evaluation(question_obj, answer_text, mode, experience, api_key=None, provider="gemini", limit=True):
+    """
+    Stream an evaluation as (event, payload) pairs.
+
+    Emits `feedback_delta`/`feedback`/`scores` while tokens arrive, then a
+    final `result` with the parsed evaluation, or a single `error`.
+    """
+    prompt = _evaluation_prompt(question_obj, answer_text, mode, experience)
+    parser = EvalStreamParser()
+    try:
+        for chunk in _stream_response(prompt, max_new_tokens=700, provider=provider, api_key=api_key, limit=limit):
+            yield from parser.feed(chunk)
+    except Exception as e:
+        yield "error", {"message": str(e), "provider": provider, "used_user_key": bool(api_key)}
+        return
+    yield "result", _parse_evaluation(parser.buf, question_obj.get("id", 0))
+
+
+async def astream_evaluation(question_obj, answer_text, mode, experience, api_key=None, provider="gemini"):
+    """Async iterator over `stream_evaluation` that pulls chunks on the LLM pool."""
+    try:
+        await _alimit(_evaluation_prompt(question_obj, answer_text, mode, experience),
+                      max_new_tokens=700, provider=provider, api_key=api_key)
+    except (RateLimited, DeadlineExceeded) as e:
+        message = handle_api_error(provider, e)[0] if isinstance(e, DeadlineExceeded) else str(e)
+        yield "error", {"message": message, "provider": provider, "used_user_key": bool(api_key)}
+        return
+    loop = asyncio.get_running_loop()
+    events = stream_evaluation(question_obj, answer_text, mode, experience,
+                               api_key=api_key, provider=provider, limit=False)
+    done = object()
+    while True:
+        item = await loop.run_in_executor(_llm_executor, deadline.bind(next, events, done))
+        if item is done:
+            return
+        yield item
 
+
+# ------------------ BATCH EVALUATION ------------------
+
+def _batch_evaluation_prompt(items, mode, experience):
+    blocks = "\n".join(
+        f'''
+Question {q.get("id", 0)}: "{q.get("question", "")}"
+Candidate Answer {q.get("id", 0)}: "{answer}"'''
+        for q, answer in items
+    )
+    return f"""
+You are an expert interviewer & coach. Evaluate each of the candidate's answers independently.
+
+Mode: {mode}
+Experience: {experience}
+{blocks}
+
+For every question, score on 3 scales (1-10):
+- technical (or content accuracy)
+- communication
+- confidence & structure
+
+Also provide, per question:
+- 3-line actionable feedback
+- an improved example (if behavioral show STAR example, if technical show concise correction or recommended steps)
+- 1-2 short resource links (just URLs or titles)
+
+Return a JSON array only, one object per question, like:
+[
+ {{
+  "question_id": 1,
+  "scores": {{"technical": 0, "communication": 0, "confidence": 0}},
+  "feedback": "short actionable feedback",
+  "examples_or_corrections": "improved answer or short corrected steps",
+  "resources": ["https://..."]
+ }},
+ ...
+]
+"""
+
+
+def _is_batch(value):
+    return isinstance(value, list) or "results" in value or "evaluations" in value
+
+
+def _split_batch(text, items):
+    """Map the batch output back to per-question results; None marks items to redo."""
+    parsed = safe_parse_json(text, accept=_is_batch)
     if isinstance(parsed, dict) and "error" in parsed:
         return parsed
+    if isinstance(parsed, dict):
+        parsed = parsed.get("results") or parsed.get("evaluations") or [parsed]
+    if not isinstance(parsed, list):
+        parsed = []
+
+    by_id = {}
+    for obj in parsed:
+        if not isinstance(obj, dict):
+            continue
+        try:
+            ev = EvalResponse(**obj)
+        except (ValidationError, TypeError):
+            continue
+        by_id.setdefault(ev.question_id, ev.dict())
+    return [by_id.get(q.get("id", 0)) for q, _ in items]
+
+
+def _batch_tokens(n):
+    return min(600 * n + 200, 4096)
+
+
+# Per-item re-evaluations a single batch may run at once
+BATCH_FALLBACK_CONCURRENCY = int(os.getenv("BATCH_FALLBACK_CONCURRENCY", "4"))
+
+
+def evaluate_answers_batch(items, mode, experience, api_key=None, provider="gemini"):
+    """
+    Evaluate several (question_obj, answer_text) pairs with one LLM call.
+
+    Returns a list of evaluations in input order. Items the model skipped or
+    returned malformed are re-evaluated individually with `evaluate_answer`.
+    """
+    prompt = _batch_evaluation_prompt(items, mode, experience)
+    text = _generate_response(prompt, max_new_tokens=_batch_tokens(len(items)), provider=provider, api_key=api_key)
+    results = _split_batch(text, items)
+    if isinstance(results, dict):
+        return results
+    return [
+        res if res is not None else evaluate_answer(q, answer, mode, experience, api_key=api_key, provider=provider)
+        for res, (q, answer) in zip(results, items)
+    ]
+
+
+async def aevaluate_answers_batch(items, mode, experience, api_key=None, provider="gemini"):
+    """
+    Async variant of `evaluate_answers_batch`; per-item fallbacks run
+    concurrently, at most BATCH_FALLBACK_CONCURRENCY at a time.
+    """
+    prompt = _batch_evaluation_prompt(items, mode, experience)
+    text = await _agenerate_response(
+        prompt, max_new_tokens=_batch_tokens(len(items)), provider=provider, api_key=api_key
+    )
+    results = _split_batch(text, items)
+    if isinstance(results, dict):
+        return results
+
+    redo = [i for i, res in enumerate(results) if res is None]
+    slots = asyncio.Semaphore(BATCH_FALLBACK_CONCURRENCY)
+
+    async def reevaluate(i):
+        async with slots:
+            return await aevaluate_answer(items[i][0], items[i][1], mode, experience,
+                                          api_key=api_key, provider=provider)
 
-    if isinstance(parsed, dict) and "raw" in parsed:
-        return {
-            "question_id": qid,
-            "scores": {"technical": 5, "communication": 5, "confidence": 5},
-            "feedback": parsed["raw"],
-            "examples_or_corrections": "",
-            "resources": [],
-        }
-    return parsed
+    retried = await asyncio.gather(*(reevaluate(i) for i in redo))
+    for i, res in zip(redo, retried):
+        results[i] = res
+    return results
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from services.exports_janitor import ExportsJanitor
+
+CacheKey = Tuple[str, str, str]
+
+
+def content_hash(answers: list, final_report: Optional[dict]) -> str:
+    """Hash of everything a report renders from, so equal hashes mean identical PDFs."""
+    payload = json.dumps({"answers": answers, "final_report": final_report}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def etag_for(key: CacheKey, fmt: str = "pdf") -> str:
+    """Strong ETag for one representation (raw PDF or base64 JSON) of a render."""
+    _, variant, digest = key
+    return f'"{variant}-{fmt}-{digest}"'
+
+
+class PDFCache:
+    """
+    Byte-level cache of rendered PDFs keyed by (session_id, variant, content hash).
+
+    The memory tier is an LRU bounded by total bytes. An optional disk tier
+    in `disk_dir` keeps renders across restarts and workers; files are
+    written atomically, so concurrent readers never see a partial PDF.
+    The disk tier is bounded by `janitor`, an ExportsJanitor over
+    `disk_dir` that is told about every write and disk hit. Async callers
+    use `aget`/`aput`, which serve memory hits inline and run disk-tier
+    I/O in a thread.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 janitor: Optional[ExportsJanitor] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.janitor = janitor
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _path(self, key: CacheKey) -> str:
+        session_id, variant, digest = key
+        safe_id = "".join(c for c in session_id if c.isalnum() or c == "-")
+        return os.path.join(self.disk_dir, f"{safe_id}_{variant}_{digest}.pdf")
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        pdf = self._memory_get(key)
+        if pdf is None and self.disk_dir:
+            pdf = self._disk_get(key)
+        if pdf is None:
+            self.stats["misses"] += 1
+        return pdf
+
+    async def aget(self, key: CacheKey) -> Optional[bytes]:
+        pdf = self._memory_get(key)
+        if pdf is None and self.disk_dir:
+            pdf = await asyncio.to_thread(self._disk_get, key)
+        if pdf is None:
+            self.stats["misses"] += 1
+        return pdf
+
+    def put(self, key: CacheKey, pdf: bytes):
+        self._remember(key, pdf)
+        if self.disk_dir:
+            self._disk_put(key, pdf)
+
+    async def aput(self, key: CacheKey, pdf: bytes):
+        self._remember(key, pdf)
+        if self.disk_dir:
+            await asyncio.to_thread(self._disk_put, key, pdf)
+
+    def _memory_get(self, key: CacheKey) -> Optional[bytes]:
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+            return pdf
+
+    def _disk_get(self, key: CacheKey) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pdf = f.read()
+        except OSError:
+            return None
+        if not pdf:
+            return None
+        self.stats["disk_hits"] += 1
+        self._touch(path, len(pdf))
+        self._remember(key, pdf)
+        return pdf
+
+    def _disk_put(self, key: CacheKey, pdf: bytes):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(pdf)
+            os.replace(tmp, path)
+            if self.janitor is not None:
+                self.janitor.track(path, len(pdf))
+        except OSError:
+            # The disk tier is best effort; the memory copy still serves
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _touch(self, path: str, size: int):
+        # Hits keep a file young, so the janitor drops the least recently used first
+        if self.janitor is None:
+            return
+        try:
+            os.utime(path)
+        except OSError:
+            return
+        self.janitor.track(path, size)
+
+    def _remember(self, key: CacheKey, pdf: bytes):
+        if len(pdf) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = pdf
+            self._size += len(pdf)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def build_pdf_cache() -> PDFCache:
+    """
+    Cache from PDF_CACHE_* env vars. The disk tier (PDF_CACHE_DIR) is kept
+    under PDF_CACHE_DISK_MAX_BYTES and PDF_CACHE_DISK_MAX_AGE_HOURS; 0
+    disables a quota.
+    """
+    disk_dir = os.getenv("PDF_CACHE_DIR") or None
+    janitor = None
+    if disk_dir:
+        max_age = float(os.getenv("PDF_CACHE_DISK_MAX_AGE_HOURS", "72")) * 3600
+        max_bytes = int(os.getenv("PDF_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+        janitor = ExportsJanitor(
+            disk_dir,
+            max_age=max_age or None,
+            max_bytes=max_bytes or None,
+            interval=float(os.getenv("EXPORTS_SWEEP_INTERVAL", "300")),
+            rescan_interval=float(os.getenv("EXPORTS_RESCAN_INTERVAL", "3600")),
+        )
+    return PDFCache(
+        max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        disk_dir=disk_dir,
+        janitor=janitor,
+    )
@@ -1,7 +1,9 @@
 import os
+import copy
 import base64
+import functools
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -9,88 +11,217 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "exports")
+# Files the app writes; kept apart from anything committed under exports/ so the janitor only sweeps its own
+GENERATED_DIR = os.path.join(EXPORTS_DIR, "generated")
+
+# ---- TEMPLATES ----
+
+def _build_styles():
+    """Sample style sheet plus the custom paragraph styles used by the reports."""
+    styles = getSampleStyleSheet()
+
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#007bff')
+    ))
+
+    # Header style
+    styles.add(ParagraphStyle(
+        name='CustomHeading1',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=12,
+        textColor=colors.HexColor('#007bff')
+    ))
+
+    # Subheader style
+    styles.add(ParagraphStyle(
+        name='CustomHeading2',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=8,
+        textColor=colors.HexColor('#333333')
+    ))
+
+    # Question style
+    styles.add(ParagraphStyle(
+        name='Question',
+        parent=styles['Normal'],
+        fontSize=12,
+        spaceAfter=6,
+        leftIndent=20,
+        textColor=colors.HexColor('#007bff'),
+        fontName='Helvetica-Bold'
+    ))
+
+    # Answer style
+    styles.add(ParagraphStyle(
+        name='Answer',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=8,
+        leftIndent=20,
+        textColor=colors.HexColor('#666666'),
+        fontName='Helvetica-Oblique'
+    ))
+
+    # Feedback style
+    styles.add(ParagraphStyle(
+        name='Feedback',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=8,
+        leftIndent=20,
+        textColor=colors.HexColor('#333333')
+    ))
+    return styles
+
+
+class ReportTemplates:
+    """
+    Static pieces of the report stories, built once per process.
+
+    Styles, table styles and fixed paragraphs (titles, section headings,
+    labels) are parsed here; renders only build the paragraphs that carry
+    per-session values. Fixed paragraphs are handed out as shallow copies,
+    since layout stores its wrap state on the flowable.
+    """
 
-class PDFService:
     def __init__(self):
-        self.output_dir = os.path.join(os.path.dirname(__file__), "..", "..", "exports")
+        self.styles = _build_styles()
+        heading = self.styles['CustomHeading1']
+        normal = self.styles['Normal']
+
+        self.score_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#007bff')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        self.details_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f8f9fa')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+
+        self._fixed = {
+            "report_title": Paragraph("AI Interview Report", self.styles['CustomTitle']),
+            "summary_title": Paragraph("Interview Summary", self.styles['CustomTitle']),
+            "overall": Paragraph("Overall Performance", heading),
+            "overview": Paragraph("Performance Overview", heading),
+            "qa": Paragraph("Interview Questions & Answers", heading),
+            "details": Paragraph("Session Details", heading),
+            "resources": Paragraph("Recommended Resources", heading),
+            "key_resources": Paragraph("Key Resources", heading),
+            "answer_label": Paragraph("<b>Your Answer:</b>", normal),
+            "feedback_label": Paragraph("<b>AI Feedback:</b>", normal),
+            "improvement_label": Paragraph("<b>Suggested Improvement:</b>", normal),
+        }
+
+    def fixed(self, name: str) -> Paragraph:
+        return copy.copy(self._fixed[name])
+
+    @staticmethod
+    def gap(height: int) -> Spacer:
+        return Spacer(1, height)
+
+    def section(self, name: str) -> List[Any]:
+        """A fixed heading followed by its usual gap."""
+        return [self.fixed(name), self.gap(12)]
+
+    def info_block(self, rows: List[Tuple[str, str]]) -> List[Any]:
+        normal = self.styles['Normal']
+        story = [Paragraph(f"<b>{label}:</b> {value}", normal) for label, value in rows]
+        story.append(self.gap(20))
+        return story
+
+    def score_table(self, rows: List[List[str]]) -> Table:
+        table = Table([['Metric', 'Score']] + rows, colWidths=[2*inch, 1.5*inch])
+        table.setStyle(self.score_table_style)
+        return table
+
+    def details_table(self, rows: List[List[str]]) -> Table:
+        table = Table(rows, colWidths=[2*inch, 2*inch])
+        table.setStyle(self.details_table_style)
+        return table
+
+    def resources(self, name: str, resources: List[str]) -> List[Any]:
+        if not resources:
+            return []
+        normal = self.styles['Normal']
+        story = self.section(name)
+        for resource in resources:
+            story.append(Paragraph(f"• {resource}", normal))
+            story.append(self.gap(4))
+        return story
+
+    def footer(self, stamp: str) -> List[Any]:
+        return [self.gap(20), Paragraph(f"Generated by AI Interview Prep Bot on {stamp}", self.styles['Normal'])]
+
+
+@functools.lru_cache(maxsize=1)
+def report_templates() -> ReportTemplates:
+    """Process-wide templates shared by every PDFService."""
+    return ReportTemplates()
+
+
+def _stamp() -> str:
+    return datetime.now().strftime('%B %d, %Y at %I:%M %p')
+
+
+class PDFService:
+    def __init__(self, templates: ReportTemplates = None, janitor=None):
+        self.output_dir = GENERATED_DIR
+        # ExportsJanitor that is told about every file written to output_dir
+        self.janitor = janitor
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # Initialize ReportLab styles
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.templates = templates or report_templates()
+        self.styles = self.templates.styles
     
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles for the PDF."""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#007bff')
-        ))
-        
-        # Header style
-        self.styles.add(ParagraphStyle(
-            name='CustomHeading1',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            spaceAfter=12,
-            textColor=colors.HexColor('#007bff')
-        ))
-        
-        # Subheader style
-        self.styles.add(ParagraphStyle(
-            name='CustomHeading2',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=8,
-            textColor=colors.HexColor('#333333')
-        ))
-        
-        # Question style
-        self.styles.add(ParagraphStyle(
-            name='Question',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=6,
-            leftIndent=20,
-            textColor=colors.HexColor('#007bff'),
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Answer style
-        self.styles.add(ParagraphStyle(
-            name='Answer',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=8,
-            leftIndent=20,
-            textColor=colors.HexColor('#666666'),
-            fontName='Helvetica-Oblique'
-        ))
-        
-        # Feedback style
-        self.styles.add(ParagraphStyle(
-            name='Feedback',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=8,
-            leftIndent=20,
-            textColor=colors.HexColor('#333333')
-        ))
-    
-    def generate_interview_report_pdf(self, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> str:
-        """Generate a comprehensive PDF report for an interview session."""
-        
-        # Validate input data
+    def _validate(self, session_data: Dict[str, Any], report_data: Dict[str, Any]):
         if not session_data:
             raise ValueError("Session data is required")
         if not report_data:
             raise ValueError("Report data is required")
+
+    def _render(self, story: List[Any]) -> bytes:
+        """Lay out a story into PDF bytes entirely in memory."""
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4,
+                              rightMargin=72, leftMargin=72,
+                              topMargin=72, bottomMargin=18)
+        doc.build(story)
+        return buffer.getvalue()
+
+    @staticmethod
+    def report_filename(kind: str, session_data: Dict[str, Any]) -> str:
+        """Download filename, e.g. interview_report_<name>_<timestamp>.pdf."""
+        candidate_name = session_data.get("meta", {}).get("name", "Anonymous")
+        return f"interview_{kind}_{candidate_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+    def render_interview_report(self, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> bytes:
+        """Render the comprehensive interview report and return the PDF bytes."""
+        self._validate(session_data, report_data)
         
         # Prepare data with validation
         meta = session_data.get("meta", {})
@@ -107,67 +238,37 @@ class PDFService:
         if not answers:
             raise ValueError("No answers found in session data")
         
-        # Generate filename and filepath
-        filename = f"interview_report_{candidate_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join(self.output_dir, filename)
-        
         try:
-            # Create PDF document
-            doc = SimpleDocTemplate(filepath, pagesize=A4, 
-                                  rightMargin=72, leftMargin=72, 
-                                  topMargin=72, bottomMargin=18)
-            
-            # Build content
-            story = []
-            
-            # Title
-            story.append(Paragraph("AI Interview Report", self.styles['CustomTitle']))
-            story.append(Spacer(1, 12))
+            t = self.templates
+            stamp = _stamp()
+            story = [t.fixed("report_title"), t.gap(12)]
             
             # Candidate info
-            story.append(Paragraph(f"<b>Candidate:</b> {candidate_name}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Role:</b> {role}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Domain:</b> {domain}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Experience:</b> {experience}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Interview Mode:</b> {mode}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Date:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", self.styles['Normal']))
-            story.append(Spacer(1, 20))
+            story += t.info_block([
+                ("Candidate", candidate_name),
+                ("Role", role),
+                ("Domain", domain),
+                ("Experience", experience),
+                ("Interview Mode", mode),
+                ("Date", stamp),
+            ])
             
             # Overall Performance Section
-            story.append(Paragraph("Overall Performance", self.styles['CustomHeading1']))
-            story.append(Spacer(1, 12))
-            
-            # Create scores table
-            scores_data = [
-                ['Metric', 'Score'],
+            story += t.section("overall")
+            story.append(t.score_table([
                 ['Overall Score', f"{report_data.get('overall_score', 0):.1f}/10"],
                 ['Technical', f"{report_data.get('avg_technical', 0):.1f}/10"],
                 ['Communication', f"{report_data.get('avg_communication', 0):.1f}/10"],
                 ['Confidence', f"{report_data.get('avg_confidence', 0):.1f}/10"]
-            ]
-            
-            scores_table = Table(scores_data, colWidths=[2*inch, 1.5*inch])
-            scores_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#007bff')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
             ]))
-            
-            story.append(scores_table)
-            story.append(Spacer(1, 20))
+            story.append(t.gap(20))
             
             # Questions and Answers Section
-            story.append(Paragraph("Interview Questions & Answers", self.styles['CustomHeading1']))
-            story.append(Spacer(1, 12))
+            story += t.section("qa")
+            questions_by_id = {q["id"]: q for q in questions}
             
             for answer in answers:
-                # Find the corresponding question
-                question = next((q for q in questions if q["id"] == answer["question_id"]), None)
+                question = questions_by_id.get(answer["question_id"])
                 
                 if question:
                     # Question header with scores
@@ -179,67 +280,46 @@ class PDFService:
                         question_header += f" | Technical: {scores.get('technical', 0)}/10 | Communication: {scores.get('communication', 0)}/10 | Confidence: {scores.get('confidence', 0)}/10"
                     
                     story.append(Paragraph(question_header, self.styles['CustomHeading2']))
-                    story.append(Spacer(1, 6))
+                    story.append(t.gap(6))
                     
                     # Question text
                     story.append(Paragraph(f"<b>Question:</b> {question['question']}", self.styles['Question']))
-                    story.append(Spacer(1, 6))
+                    story.append(t.gap(6))
                     
                     # Answer
-                    story.append(Paragraph(f"<b>Your Answer:</b>", self.styles['Normal']))
+                    story.append(t.fixed("answer_label"))
                     story.append(Paragraph(answer['answer'], self.styles['Answer']))
-                    story.append(Spacer(1, 6))
+                    story.append(t.gap(6))
                     
                     # Feedback
                     if eval_data.get('feedback'):
-                        story.append(Paragraph(f"<b>AI Feedback:</b>", self.styles['Normal']))
+                        story.append(t.fixed("feedback_label"))
                         story.append(Paragraph(eval_data['feedback'], self.styles['Feedback']))
-                        story.append(Spacer(1, 6))
+                        story.append(t.gap(6))
                     
                     # Improvement suggestions
                     if eval_data.get('examples_or_corrections'):
-                        story.append(Paragraph(f"<b>Suggested Improvement:</b>", self.styles['Normal']))
+                        story.append(t.fixed("improvement_label"))
                         story.append(Paragraph(eval_data['examples_or_corrections'], self.styles['Feedback']))
-                        story.append(Spacer(1, 6))
+                        story.append(t.gap(6))
                     
-                    story.append(Spacer(1, 12))
-            
-            # Resources Section
-            resources = report_data.get("resources", [])
-            if resources:
-                story.append(Paragraph("Recommended Resources", self.styles['CustomHeading1']))
-                story.append(Spacer(1, 12))
-                
-                for resource in resources:
-                    story.append(Paragraph(f"• {resource}", self.styles['Normal']))
-                    story.append(Spacer(1, 4))
-            
-            # Footer
-            story.append(Spacer(1, 20))
-            story.append(Paragraph(f"Generated by AI Interview Prep Bot on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
-                                 self.styles['Normal']))
-            
-            # Build PDF
-            doc.build(story)
+                    story.append(t.gap(12))
             
-            # Verify file was created
-            if not os.path.exists(filepath):
-                raise RuntimeError("PDF file was not created successfully")
+            story += t.resources("resources", report_data.get("resources", []))
+            story += t.footer(stamp)
             
-            return filepath
-        except (OSError, IOError) as e:
-            raise RuntimeError(f"File system error while generating PDF: {str(e)}")
+            return self._render(story)
         except Exception as e:
             raise RuntimeError(f"Failed to generate PDF: {str(e)}")
+
+    def generate_interview_report_pdf(self, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> str:
+        """Generate the comprehensive report and save it under exports/generated/; returns the path."""
+        pdf = self.render_interview_report(session_data, report_data)
+        return self._save(self.report_filename("report", session_data), pdf)
     
-    def generate_summary_pdf(self, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> str:
-        """Generate a concise summary PDF."""
-        
-        # Validate input data
-        if not session_data:
-            raise ValueError("Session data is required")
-        if not report_data:
-            raise ValueError("Report data is required")
+    def render_summary(self, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> bytes:
+        """Render the concise summary and return the PDF bytes."""
+        self._validate(session_data, report_data)
         
         # Prepare data with validation
         meta = session_data.get("meta", {})
@@ -247,113 +327,71 @@ class PDFService:
         role = meta.get("role", "Unknown Role")
         mode = meta.get("mode", "technical").title()
         
-        # Generate filename and filepath
-        filename = f"interview_summary_{candidate_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join(self.output_dir, filename)
-        
         try:
-            # Create PDF document
-            doc = SimpleDocTemplate(filepath, pagesize=A4, 
-                                  rightMargin=72, leftMargin=72, 
-                                  topMargin=72, bottomMargin=18)
-            
-            # Build content
-            story = []
-            
-            # Title
-            story.append(Paragraph("Interview Summary", self.styles['CustomTitle']))
-            story.append(Spacer(1, 12))
+            t = self.templates
+            stamp = _stamp()
+            story = [t.fixed("summary_title"), t.gap(12)]
             
             # Candidate info
-            story.append(Paragraph(f"<b>Candidate:</b> {candidate_name}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Role:</b> {role}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Mode:</b> {mode}", self.styles['Normal']))
-            story.append(Paragraph(f"<b>Date:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", self.styles['Normal']))
-            story.append(Spacer(1, 20))
+            story += t.info_block([
+                ("Candidate", candidate_name),
+                ("Role", role),
+                ("Mode", mode),
+                ("Date", stamp),
+            ])
             
             # Performance Overview
-            story.append(Paragraph("Performance Overview", self.styles['CustomHeading1']))
-            story.append(Spacer(1, 12))
+            story += t.section("overview")
             
             # Overall score (highlighted)
             overall_score = report_data.get('overall_score', 0)
             story.append(Paragraph(f"<b>Overall Score: {overall_score:.1f}/10</b>", self.styles['CustomHeading1']))
-            story.append(Spacer(1, 12))
+            story.append(t.gap(12))
             
             # Detailed scores table
-            scores_data = [
-                ['Metric', 'Score'],
+            story.append(t.score_table([
                 ['Technical', f"{report_data.get('avg_technical', 0):.1f}/10"],
                 ['Communication', f"{report_data.get('avg_communication', 0):.1f}/10"],
                 ['Confidence', f"{report_data.get('avg_confidence', 0):.1f}/10"]
-            ]
-            
-            scores_table = Table(scores_data, colWidths=[2*inch, 1.5*inch])
-            scores_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#007bff')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
             ]))
-            
-            story.append(scores_table)
-            story.append(Spacer(1, 20))
+            story.append(t.gap(20))
             
             # Session Details
-            story.append(Paragraph("Session Details", self.styles['CustomHeading1']))
-            story.append(Spacer(1, 12))
-            
-            session_details = [
+            story += t.section("details")
+            story.append(t.details_table([
                 ['Questions Answered', str(report_data.get('n_questions', 0))],
                 ['Interview Mode', mode],
                 ['Target Role', role]
-            ]
-            
-            details_table = Table(session_details, colWidths=[2*inch, 2*inch])
-            details_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f8f9fa')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
             ]))
+            story.append(t.gap(20))
             
-            story.append(details_table)
-            story.append(Spacer(1, 20))
-            
-            # Resources Section
-            resources = report_data.get("resources", [])
-            if resources:
-                story.append(Paragraph("Key Resources", self.styles['CustomHeading1']))
-                story.append(Spacer(1, 12))
-                
-                for resource in resources:
-                    story.append(Paragraph(f"• {resource}", self.styles['Normal']))
-                    story.append(Spacer(1, 4))
-            
-            # Footer
-            story.append(Spacer(1, 20))
-            story.append(Paragraph(f"Generated by AI Interview Prep Bot on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
-                                 self.styles['Normal']))
-            
-            # Build PDF
-            doc.build(story)
+            story += t.resources("key_resources", report_data.get("resources", []))
+            story += t.footer(stamp)
             
-            # Verify file was created
-            if not os.path.exists(filepath):
-                raise RuntimeError("Summary PDF file was not created successfully")
-            
-            return filepath
-        except (OSError, IOError) as e:
-            raise RuntimeError(f"File system error while generating summary PDF: {str(e)}")
+            return self._render(story)
         except Exception as e:
             raise RuntimeError(f"Failed to generate summary PDF: {str(e)}")
+
+    def generate_summary_pdf(self, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> str:
+        """Generate the summary and save it under exports/generated/; returns the path."""
+        pdf = self.render_summary(session_data, report_data)
+        return self._save(self.report_filename("summary", session_data), pdf)
+
+    def _save(self, filename: str, pdf: bytes) -> str:
+        filepath = os.path.join(self.output_dir, filename)
+        try:
+            with open(filepath, 'wb') as f:
+                f.write(pdf)
+        except (OSError, IOError) as e:
+            raise RuntimeError(f"File system error while saving PDF: {str(e)}")
+        if self.janitor is not None:
+            self.janitor.track(filepath, len(pdf))
+        return filepath
     
+    @staticmethod
+    def encode_base64(pdf: bytes) -> str:
+        return base64.b64encode(pdf).decode('utf-8')
+
     def get_pdf_as_base64(self, filepath: str) -> str:
         """Convert PDF file to base64 string for download."""
         try:
@@ -363,18 +401,11 @@ class PDFService:
         except Exception as e:
             raise Exception(f"Failed to read PDF file: {str(e)}")
     
-    def cleanup_old_files(self, max_age_hours: int = 24):
-        """Clean up old PDF files to save disk space."""
-        import time
-        current_time = time.time()
-        max_age_seconds = max_age_hours * 3600
-        
+    def cleanup_old_files(self, max_age_hours: int = 24) -> int:
+        """Clean up old PDF files to save disk space; returns how many were removed."""
+        from services.exports_janitor import ExportsJanitor
         try:
-            for filename in os.listdir(self.output_dir):
-                if filename.endswith('.pdf'):
-                    filepath = os.path.join(self.output_dir, filename)
-                    file_age = current_time - os.path.getctime(filepath)
-                    if file_age > max_age_seconds:
-                        os.remove(filepath)
+            return ExportsJanitor(self.output_dir, max_age=max_age_hours * 3600).sweep()
         except Exception as e:
-            print(f"Warning: Failed to cleanup old files: {str(e)}")
+            logger.warning("Failed to cleanup old files: %s", e)
+            return 0
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """Short, non-reversible id for an API key so raw keys never become dict keys."""
+    if not api_key:
+        return "none"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class ClientRegistry:
+    """
+    LRU cache of provider clients keyed by (provider, key hash, model).
+
+    Clients keep their HTTP connection pools, so reusing them preserves
+    keep-alive and TLS sessions across calls. Entries beyond `max_size`
+    or idle longer than `idle_ttl` seconds are closed and dropped.
+    """
+
+    def __init__(self, factory: Callable[[str, str, str], Any], max_size: int = 32, idle_ttl: float = 600.0):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._clients: "OrderedDict[Tuple[str, str, str], list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, provider: str, api_key: str, model: str):
+        key = (provider, key_fingerprint(api_key), model)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry[1] = now
+                self._clients.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            self.stats["misses"] += 1
+
+        # Build outside the lock; client setup can be slow (TLS, grpc channels)
+        client = self.factory(provider, api_key, model)
+
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                # Another thread won the race; keep theirs
+                self._close(client)
+                existing[1] = now
+                return existing[0]
+            self._clients[key] = [client, now]
+            while len(self._clients) > self.max_size:
+                _, (old, _) = self._clients.popitem(last=False)
+                self.stats["evictions"] += 1
+                self._close(old)
+        return client
+
+    def discard(self, provider: str, api_key: str, model: str):
+        """Drop a client, e.g. after an auth failure, so the next call rebuilds it."""
+        key = (provider, key_fingerprint(api_key), model)
+        with self._lock:
+            entry = self._clients.pop(key, None)
+        if entry is not None:
+            self._close(entry[0])
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for client, _ in entries:
+            self._close(client)
+
+    def __len__(self):
+        return len(self._clients)
+
+    def _evict_idle(self, now: float):
+        # Oldest-used entries sit at the front, so stop at the first fresh one
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used <= self.idle_ttl:
+                break
+            self._clients.popitem(last=False)
+            self.stats["evictions"] += 1
+            self._close(client)
+
+    @staticmethod
+    def _close(client):
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
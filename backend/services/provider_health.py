@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Provider:
+    __slots__ = ("failures", "opened_at", "probe_at", "latencies", "stats")
+
+    def __init__(self, window: int):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_at: Optional[float] = None  # start of the half-open probe in flight
+        self.latencies = deque(maxlen=window)
+        self.stats = {"successes": 0, "failures": 0, "opened": 0, "probes": 0}
+
+
+class ProviderHealth:
+    """
+    Circuit breaker and latency window per LLM provider.
+
+    After `failure_threshold` consecutive failures a provider's circuit
+    opens and it is skipped for `cooldown` seconds. After that it is
+    half-open: `acquire` lets a single probe call through while everything
+    else keeps skipping it. The probe's success closes the circuit, its
+    failure reopens it for another cooldown, and a probe that ends neither
+    way (or is never reported within a cooldown) frees the slot for the
+    next one. Successful call latencies feed `p95`, which the router uses
+    as the hedging delay.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, window: int = 200,
+                 min_samples: int = 20):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.min_samples = min_samples
+        self._providers: Dict[str, _Provider] = defaultdict(lambda: _Provider(window))
+        self._lock = threading.Lock()
+
+    def _state(self, p: _Provider, now: float) -> str:
+        if p.opened_at is None:
+            return CLOSED
+        if now - p.opened_at < self.cooldown:
+            return OPEN
+        return HALF_OPEN
+
+    def _probe_free(self, p: _Provider, now: float) -> bool:
+        return p.probe_at is None or now - p.probe_at >= self.cooldown
+
+    def available(self, provider: str) -> bool:
+        """Whether a call to `provider` could be admitted right now; claims nothing."""
+        p = self._providers[provider]
+        now = time.monotonic()
+        state = self._state(p, now)
+        return state == CLOSED or (state == HALF_OPEN and self._probe_free(p, now))
+
+    def acquire(self, provider: str) -> Optional[str]:
+        """
+        Admit one call: CLOSED for a normal call, HALF_OPEN for the recovery
+        probe, or None when the circuit turns it away. A HALF_OPEN permit
+        must end in `record_success`, `record_failure` or `release`.
+        """
+        with self._lock:
+            p = self._providers[provider]
+            now = time.monotonic()
+            state = self._state(p, now)
+            if state == CLOSED:
+                return CLOSED
+            if state == HALF_OPEN and self._probe_free(p, now):
+                p.probe_at = now
+                p.stats["probes"] += 1
+                return HALF_OPEN
+            return None
+
+    def release(self, provider: str, permit: Optional[str]):
+        """End a call that said nothing about the provider's health (bad key, cancelled...)."""
+        if permit == HALF_OPEN:
+            with self._lock:
+                self._providers[provider].probe_at = None
+
+    def record_success(self, provider: str, latency: float):
+        with self._lock:
+            p = self._providers[provider]
+            p.failures = 0
+            p.opened_at = None
+            p.probe_at = None
+            p.latencies.append(latency)
+            p.stats["successes"] += 1
+
+    def record_failure(self, provider: str):
+        with self._lock:
+            p = self._providers[provider]
+            p.failures += 1
+            p.stats["failures"] += 1
+            if p.failures >= self.failure_threshold:
+                if p.opened_at is None:
+                    p.stats["opened"] += 1
+                p.opened_at = time.monotonic()
+                p.probe_at = None
+
+    def p95(self, provider: str) -> Optional[float]:
+        """95th percentile of recent successful latencies, or None until `min_samples` exist."""
+        samples = sorted(self._providers[provider].latencies)
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            name: {**p.stats, "state": self._state(p, now), "p95": self.p95(name)}
+            for name, p in list(self._providers.items())
+        }
@@ -0,0 +1,62 @@
+import importlib
+import threading
+import time
+from typing import Optional
+
+
+class LazySDK:
+    """
+    A provider SDK imported on first use instead of at startup.
+
+    The big SDKs pull in grpc/protobuf or pydantic model trees that take
+    seconds to import on a small instance; a worker that only ever talks to
+    one provider should not pay for the other two.
+    """
+
+    def __init__(self, module: str, attr: Optional[str] = None, package: Optional[str] = None):
+        self.module = module
+        self.attr = attr
+        self.package = package or module
+        self.import_seconds: Optional[float] = None
+        self._value = None
+        self._missing: Optional[str] = None  # install hint once the import has failed
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not None
+
+    def load(self):
+        """The module (or `attr` from it); raises ImportError with an install hint."""
+        if self._value is None:
+            with self._lock:
+                if self._missing is not None:
+                    raise ImportError(self._missing)
+                if self._value is None:
+                    started = time.perf_counter()
+                    try:
+                        module = importlib.import_module(self.module)
+                    except ImportError as e:
+                        self._missing = f"{self.package} not installed. Run: pip install {self.package}"
+                        raise ImportError(self._missing) from e
+                    self.import_seconds = time.perf_counter() - started
+                    self._value = getattr(module, self.attr) if self.attr else module
+        return self._value
+
+    def available(self) -> bool:
+        try:
+            self.load()
+        except ImportError:
+            return False
+        return True
+
+    def snapshot(self) -> dict:
+        return {"loaded": self.loaded, "import_seconds": self.import_seconds}
+
+
+SDKS = {
+    "gemini": LazySDK("google.generativeai", package="google-generativeai"),
+    "groq": LazySDK("groq", "Groq"),
+    "openai": LazySDK("openai", "OpenAI"),
+}
+httpx = LazySDK("httpx")
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from schemas import Question
+
+logger = logging.getLogger(__name__)
+
+BankKey = Tuple[str, str, str, str, str]
+
+
+def _norm(value) -> str:
+    return (value or "").strip().lower()
+
+
+def parse_budgets(spec: str) -> Dict[str, int]:
+    """Parse "gemini:60,groq:30" into {"gemini": 60, "groq": 30}."""
+    budgets = {}
+    for part in (spec or "").split(","):
+        if ":" in part:
+            name, limit = part.split(":", 1)
+            budgets[name.strip().lower()] = int(limit)
+    return budgets
+
+
+def parse_presets(spec: str) -> List[tuple]:
+    """Parse "role|domain|experience|mode[|provider];..." into key tuples to pre-warm."""
+    presets = []
+    for entry in (spec or "").split(";"):
+        fields = [f.strip() for f in entry.split("|")]
+        if len(fields) >= 4:
+            presets.append((*fields[:4], fields[4] if len(fields) > 4 else "gemini"))
+    return presets
+
+
+class QuestionBank:
+    """
+    Pools of validated questions per (role, domain, experience, mode, provider).
+
+    `/start` takes questions straight from a pool; a background task keeps every
+    pool topped up to `pool_size` using the provider's server-side key. Each
+    refill is one LLM call producing `batch_size` questions, and calls per
+    provider are capped at `budgets[provider]` per hour.
+
+    Domain is free text, so a pool is only created once its key has been
+    asked for `min_demand` times, and only for providers `has_key` says the
+    server can call. Pools unused for `idle_ttl` seconds are dropped, and at
+    `max_pools` a new pool evicts the least recently used one. Presets are
+    pinned and never evicted.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[..., Awaitable],
+        pool_size: int = 24,
+        batch_size: int = 8,
+        refill_interval: float = 30.0,
+        max_refills_per_tick: int = 4,
+        budgets: Optional[Dict[str, int]] = None,
+        default_budget: int = 60,
+        max_pools: int = 64,
+        min_demand: int = 2,
+        idle_ttl: float = 3600.0,
+        has_key: Optional[Callable[[str], bool]] = None,
+    ):
+        self.generate = generate
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.refill_interval = refill_interval
+        self.max_refills_per_tick = max_refills_per_tick
+        self.budgets = budgets or {}
+        self.default_budget = default_budget
+        self.max_pools = max_pools
+        self.min_demand = min_demand
+        self.idle_ttl = idle_ttl
+        self.has_key = has_key or (lambda provider: True)
+        # Least recently used first
+        self.pools: "OrderedDict[BankKey, deque]" = OrderedDict()
+        # Original spelling of each key's fields, used for the refill prompt
+        self._params: Dict[BankKey, tuple] = {}
+        self._used: Dict[BankKey, float] = {}
+        self._pinned = set()
+        # Keys asked for that have no pool yet: key -> (times asked, last asked)
+        self._demand: "OrderedDict[BankKey, Tuple[int, float]]" = OrderedDict()
+        self._calls: Dict[str, deque] = defaultdict(deque)
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "misses": 0, "refills": 0, "refill_errors": 0, "budget_skips": 0,
+                      "evicted": 0}
+
+    @staticmethod
+    def key(role, domain, experience, mode, provider) -> BankKey:
+        return (_norm(role), _norm(domain), _norm(experience), _norm(mode), _norm(provider) or "gemini")
+
+    def want(self, role, domain, experience, mode, provider="gemini", pin=False):
+        """
+        Record demand for a pool and return it, or None while it doesn't exist.
+
+        The pool is created (and the background worker starts filling it)
+        on the `min_demand`-th request, or at once with `pin`.
+        """
+        key = self.key(role, domain, experience, mode, provider)
+        now = time.monotonic()
+        pool = self.pools.get(key)
+        if pool is not None:
+            self.pools.move_to_end(key)
+            self._used[key] = now
+            return pool
+        # Without a server key a refill would fail over and fill the pool from another model
+        if not self.has_key(key[4]):
+            return None
+
+        if not pin:
+            count, last = self._demand.pop(key, (0, now))
+            count = count + 1 if now - last <= self.idle_ttl else 1
+            if count < self.min_demand:
+                self._demand[key] = (count, now)
+                while len(self._demand) > self.max_pools * 4:
+                    self._demand.popitem(last=False)
+                return None
+        self._demand.pop(key, None)
+
+        if len(self.pools) >= self.max_pools:
+            victim = next((k for k in self.pools if k not in self._pinned), None)
+            if victim is None:
+                return None
+            self._evict(victim)
+        self.pools[key] = pool = deque()
+        self._params[key] = (role, domain, experience, mode, key[4])
+        self._used[key] = now
+        if pin:
+            self._pinned.add(key)
+        return pool
+
+    def _evict(self, key: BankKey):
+        self.pools.pop(key, None)
+        self._params.pop(key, None)
+        self._used.pop(key, None)
+        self.stats["evicted"] += 1
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop unpinned pools nobody has asked for in `idle_ttl` seconds."""
+        now = now if now is not None else time.monotonic()
+        idle = [k for k in self.pools if k not in self._pinned and now - self._used[k] > self.idle_ttl]
+        for key in idle:
+            self._evict(key)
+        return len(idle)
+
+    def take(self, role, domain, experience, mode, provider, num=4) -> Optional[List[dict]]:
+        """Pop `num` questions (renumbered 1..num), or None if the pool is short."""
+        pool = self.want(role, domain, experience, mode, provider)
+        if pool is None or len(pool) < num:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return [dict(pool.popleft(), id=i) for i in range(1, num + 1)]
+
+    def _within_budget(self, provider: str) -> bool:
+        limit = self.budgets.get(provider, self.default_budget)
+        calls = self._calls[provider]
+        cutoff = time.monotonic() - 3600
+        while calls and calls[0] < cutoff:
+            calls.popleft()
+        return len(calls) < limit
+
+    def _add(self, key: BankKey, questions) -> int:
+        pool = self.pools[key]
+        seen = {q["question"].strip().lower() for q in pool}
+        added = 0
+        for raw in questions if isinstance(questions, list) else []:
+            try:
+                q = Question(**raw) if isinstance(raw, dict) else None
+            except ValidationError:
+                q = None
+            if q is None or not q.question.strip():
+                continue
+            text = q.question.strip().lower()
+            if text in seen or len(pool) >= self.pool_size:
+                continue
+            seen.add(text)
+            pool.append(q.dict())
+            added += 1
+        return added
+
+    async def refill_once(self) -> int:
+        """Run one refill pass over the emptiest pools; returns questions added."""
+        self.evict_idle()
+        short = sorted(
+            (k for k, pool in list(self.pools.items()) if len(pool) < self.pool_size),
+            key=lambda k: len(self.pools[k]),
+        )
+        added = 0
+        for key in short[: self.max_refills_per_tick]:
+            if key not in self._params:
+                continue
+            role, domain, experience, mode, provider = self._params[key]
+            if not self._within_budget(provider):
+                self.stats["budget_skips"] += 1
+                continue
+            self._calls[provider].append(time.monotonic())
+            try:
+                qs = await self.generate(
+                    role, domain, experience, mode, num=self.batch_size,
+                    provider=provider, use_cache=False, fallback=False, failover=False,
+                )
+            except Exception:
+                logger.exception("Question bank refill failed for %s", key)
+                qs = None
+            if not isinstance(qs, list):
+                self.stats["refill_errors"] += 1
+                continue
+            self.stats["refills"] += 1
+            # The pool may have been evicted while its refill was in flight
+            if key in self.pools:
+                added += self._add(key, qs)
+        return added
+
+    async def run(self):
+        while True:
+            try:
+                await self.refill_once()
+            except Exception:
+                logger.exception("Question bank refill pass crashed")
+            await asyncio.sleep(self.refill_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def build_question_bank(generate, has_key: Optional[Callable[[str], bool]] = None) -> Optional[QuestionBank]:
+    """Create the bank from QUESTION_BANK_* env vars, or None when disabled."""
+    if os.getenv("QUESTION_BANK_ENABLED", "1") != "1":
+        return None
+    bank = QuestionBank(
+        generate,
+        pool_size=int(os.getenv("QUESTION_BANK_POOL_SIZE", "24")),
+        batch_size=int(os.getenv("QUESTION_BANK_BATCH_SIZE", "8")),
+        refill_interval=float(os.getenv("QUESTION_BANK_REFILL_INTERVAL", "30")),
+        max_refills_per_tick=int(os.getenv("QUESTION_BANK_REFILLS_PER_TICK", "4")),
+        budgets=parse_budgets(os.getenv("QUESTION_BANK_BUDGETS", "")),
+        default_budget=int(os.getenv("QUESTION_BANK_BUDGET_DEFAULT", "60")),
+        max_pools=int(os.getenv("QUESTION_BANK_MAX_POOLS", "64")),
+        min_demand=int(os.getenv("QUESTION_BANK_MIN_DEMAND", "2")),
+        idle_ttl=float(os.getenv("QUESTION_BANK_IDLE_TTL", "3600")),
+        has_key=has_key,
+    )
+    for preset in parse_presets(os.getenv("QUESTION_BANK_PRESETS", "")):
+        bank.want(*preset, pin=True)
+    return bank
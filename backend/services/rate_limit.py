@@ -0,0 +1,181 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from services.deadline import DeadlineExceeded
+from services.provider_clients import key_fingerprint
+
+Limits = Tuple[Optional[float], Optional[float]]  # (requests/min, tokens/min)
+
+# Free-tier quotas, as provider:requests/min:tokens/min
+DEFAULT_LIMITS = "gemini:15:1000000,groq:30:6000,openai:500:200000"
+
+
+class RateLimited(Exception):
+    pass
+
+
+def estimate_tokens(prompt: str, max_new_tokens: int) -> int:
+    """Rough request cost: ~4 characters per prompt token plus the completion budget."""
+    return len(prompt) // 4 + max_new_tokens
+
+
+def parse_limits(spec: str) -> Dict[str, Limits]:
+    """Parse "gemini:15:1000000,groq:30:6000" into {provider: (rpm, tpm)}; 0 or blank means unlimited."""
+    limits = {}
+    for part in (spec or "").split(","):
+        fields = [f.strip() for f in part.split(":")]
+        if len(fields) >= 2 and fields[0]:
+            rpm = float(fields[1] or 0) or None
+            tpm = (float(fields[2] or 0) or None) if len(fields) > 2 else None
+            limits[fields[0].lower()] = (rpm, tpm)
+    return limits
+
+
+class TokenBucket:
+    """
+    Bucket refilled at `per_minute / 60` per second, holding at most one minute's worth.
+
+    `reserve` always succeeds and may drive the level negative; the returned
+    delay is how long the caller must wait for its share to be refilled, so
+    concurrent callers queue up in arrival order.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A single request larger than the bucket would otherwise wait forever
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float):
+        self.level += min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Client-side requests/min and tokens/min limits per API key.
+
+    Calls made with the server's .env key share the provider's buckets
+    (`provider_limits`, the server account's quota); calls made with a
+    user's own key only draw on that key's buckets (`key_limits`), so one
+    user's traffic never throttles another's. Callers reserve capacity in
+    every bucket that applies and then sleep until the slowest one has
+    refilled, so bursts are spread out instead of tripping provider quotas.
+    A request that would wait longer than `max_wait` is refused with
+    RateLimited, and one that would outlive the caller's deadline with
+    DeadlineExceeded; either way its reservation is returned, as it is when
+    a waiting caller is cancelled. Per-key buckets are kept for the
+    `max_keys` most recently used keys.
+    """
+
+    def __init__(self, provider_limits: Optional[Dict[str, Limits]] = None,
+                 key_limits: Optional[Dict[str, Limits]] = None,
+                 max_wait: float = 30.0, max_keys: int = 1024):
+        self.provider_limits = provider_limits or {}
+        self.key_limits = key_limits or {}
+        self.max_wait = max_wait
+        self.max_keys = max_keys
+        self._provider_buckets: Dict[str, List[Tuple[TokenBucket, bool]]] = {}
+        self._key_buckets: "OrderedDict[Tuple[str, str], List[Tuple[TokenBucket, bool]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = defaultdict(lambda: {"requests": 0, "delayed": 0, "rejected": 0,
+                                          "wait_seconds": 0.0, "max_wait": 0.0, "waiting": 0})
+
+    @staticmethod
+    def _make(limits: Limits) -> List[Tuple[TokenBucket, bool]]:
+        # (bucket, counts tokens rather than requests)
+        rpm, tpm = limits
+        return [(TokenBucket(v), is_tokens) for v, is_tokens in ((rpm, False), (tpm, True)) if v]
+
+    def _buckets(self, provider: str, api_key: Optional[str]) -> List[Tuple[TokenBucket, bool]]:
+        if not api_key:
+            if provider not in self.provider_limits:
+                return []
+            if provider not in self._provider_buckets:
+                self._provider_buckets[provider] = self._make(self.provider_limits[provider])
+            return self._provider_buckets[provider]
+        if provider not in self.key_limits:
+            return []
+        key = (provider, key_fingerprint(api_key))
+        if key not in self._key_buckets:
+            self._key_buckets[key] = self._make(self.key_limits[provider])
+            while len(self._key_buckets) > self.max_keys:
+                self._key_buckets.popitem(last=False)
+        self._key_buckets.move_to_end(key)
+        return self._key_buckets[key]
+
+    def reserve(self, provider: str, api_key: Optional[str], tokens: int, within: Optional[float] = None) -> float:
+        """
+        Reserve one request of `tokens`; returns seconds to wait before sending it.
+
+        `api_key` is the user's own key, or None for the server's .env key.
+        `within` is the time left before the caller's deadline, if it has one.
+        """
+        stats = self.stats[provider]
+        with self._lock:
+            buckets = self._buckets(provider, api_key)
+            now = time.monotonic()
+            wait = 0.0
+            for bucket, is_tokens in buckets:
+                wait = max(wait, bucket.reserve(tokens if is_tokens else 1, now))
+            if wait > self.max_wait or (within is not None and wait > within):
+                for bucket, is_tokens in buckets:
+                    bucket.refund(tokens if is_tokens else 1)
+                stats["rejected"] += 1
+                if wait <= self.max_wait:
+                    raise DeadlineExceeded("Request deadline exceeded while waiting for the rate limit")
+                raise RateLimited(
+                    f"⚠️ Too many requests to {provider.title()} right now. Please retry in a few seconds.")
+            stats["requests"] += 1
+            if wait > 0:
+                stats["delayed"] += 1
+                stats["wait_seconds"] += wait
+                stats["max_wait"] = max(stats["max_wait"], wait)
+        return wait
+
+    def refund(self, provider: str, api_key: Optional[str], tokens: int):
+        """Return a reservation whose request was never sent."""
+        with self._lock:
+            for bucket, is_tokens in self._buckets(provider, api_key):
+                bucket.refund(tokens if is_tokens else 1)
+
+    async def acquire(self, provider: str, api_key: Optional[str], tokens: int, within: Optional[float] = None):
+        wait = self.reserve(provider, api_key, tokens, within)
+        if wait > 0:
+            stats = self.stats[provider]
+            stats["waiting"] += 1
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.refund(provider, api_key, tokens)
+                raise
+            finally:
+                stats["waiting"] -= 1
+
+    def acquire_sync(self, provider: str, api_key: Optional[str], tokens: int, within: Optional[float] = None):
+        wait = self.reserve(provider, api_key, tokens, within)
+        if wait > 0:
+            time.sleep(wait)
+
+
+def build_rate_limiter() -> RateLimiter:
+    """
+    Limits from LLM_RATE_LIMITS (the server's .env keys) and LLM_KEY_RATE_LIMITS
+    (each user-supplied key), as provider:rpm:tpm; both default to free-tier quotas.
+    """
+    return RateLimiter(
+        provider_limits=parse_limits(os.getenv("LLM_RATE_LIMITS", DEFAULT_LIMITS)),
+        key_limits=parse_limits(os.getenv("LLM_KEY_RATE_LIMITS", DEFAULT_LIMITS)),
+        max_wait=float(os.getenv("LLM_RATE_MAX_WAIT", "30")),
+        max_keys=int(os.getenv("LLM_RATE_MAX_KEYS", "1024")),
+    )
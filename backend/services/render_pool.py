@@ -0,0 +1,126 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from services.metrics import pdf_render_seconds
+
+# One PDFService per worker process; its style sheet is built once in the initializer
+_worker_service = None
+
+
+def _init_worker():
+    global _worker_service
+    from services.pdf_service import PDFService
+    _worker_service = PDFService()
+
+
+def _warm():
+    return os.getpid()
+
+
+def _render(kind: str, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> bytes:
+    if _worker_service is None:
+        _init_worker()
+    if kind == "report":
+        return _worker_service.render_interview_report(session_data, report_data)
+    return _worker_service.render_summary(session_data, report_data)
+
+
+class RenderOverloaded(Exception):
+    pass
+
+
+class RenderPool:
+    """
+    Runs CPU-bound ReportLab layout in worker processes off the event loop.
+
+    At most `workers` renders run at once and `max_queue` more may wait;
+    beyond that `render` raises RenderOverloaded so the route can answer 503
+    instead of letting exports pile up behind interview traffic. With
+    `workers=0` renders run on the default thread pool instead.
+
+    A worker that dies (OOM kill, segfault) breaks the whole executor; the
+    pool then replaces it and retries the render once, and reports itself
+    not running until the replacement is in place.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, start_method: Optional[str] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight = 0
+        self.stats = {"rendered": 0, "rejected": 0, "restarts": 0}
+
+    def start(self):
+        if self._executor is not None or self.workers <= 0:
+            return
+        method = self.start_method
+        if method is None:
+            # The server process runs threads, so avoid plain fork
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(method),
+            initializer=_init_worker,
+        )
+        # Spawn every worker now so the first export doesn't pay process start-up
+        for _ in range(self.workers):
+            self._executor.submit(_warm)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        # Concurrent renders all see the same breakage; only the first replaces the executor
+        if self._executor is broken:
+            self.shutdown()
+            self.stats["restarts"] += 1
+        self.start()
+
+    @property
+    def running(self) -> bool:
+        if self.workers <= 0:
+            return True
+        # The executor flags itself broken as soon as a worker process dies
+        return self._executor is not None and not getattr(self._executor, "_broken", False)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._inflight
+
+    async def render(self, kind: str, session_data: Dict[str, Any], report_data: Dict[str, Any]) -> bytes:
+        if self._inflight >= max(self.workers, 1) + self.max_queue:
+            self.stats["rejected"] += 1
+            raise RenderOverloaded("PDF renderer is busy")
+        self.start()
+        self._inflight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._executor
+            try:
+                pdf = await loop.run_in_executor(executor, _render, kind, session_data, report_data)
+            except BrokenProcessPool:
+                self._restart(executor)
+                pdf = await loop.run_in_executor(self._executor, _render, kind, session_data, report_data)
+        finally:
+            self._inflight -= 1
+        pdf_render_seconds.observe(time.perf_counter() - started, kind)
+        self.stats["rendered"] += 1
+        return pdf
+
+
+def build_render_pool() -> RenderPool:
+    return RenderPool(
+        workers=int(os.getenv("PDF_RENDER_WORKERS", "2")),
+        max_queue=int(os.getenv("PDF_RENDER_MAX_QUEUE", "8")),
+        start_method=os.getenv("PDF_RENDER_START_METHOD") or None,
+    )
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+
+def cache_key(prompt: str, provider: str, model: str) -> str:
+    """Content address for a prompt sent to a given provider/model."""
+    h = hashlib.sha256()
+    for part in (provider, model or "", prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class MemoryTier:
+    """In-process LRU of key -> (stored_at, [variants])."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def save(self, key: str, stored_at: float, variants: List[str]):
+        with self._lock:
+            self._data[key] = (stored_at, variants)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SQLiteTier:
+    """On-disk tier so cached variants survive restarts and are shared by local workers."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored_at REAL, variants TEXT)"
+        )
+        self._lock = threading.Lock()
+
+    def load(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, variants FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def save(self, key: str, stored_at: float, variants: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, stored_at, variants) VALUES (?, ?, ?)",
+                (key, stored_at, json.dumps(variants)),
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+
+class ResponseCache:
+    """
+    Read-through cache of LLM responses with a variety policy.
+
+    Each key holds the last `variants` responses generated for it. Until
+    that many have been collected a lookup misses, so callers generate a
+    fresh one and `add` it; afterwards lookups sample one at random. Repeats
+    are kept, so a model that keeps giving the same answer fills its quota
+    like any other (and that answer is served in proportion). Entries
+    expire `ttl` seconds after their first response was stored.
+    """
+
+    def __init__(self, tiers, ttl: float = 86400.0, variants: int = 3):
+        self.tiers = list(tiers)
+        self.ttl = ttl
+        self.variants = max(1, variants)
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _load(self, key: str):
+        for i, tier in enumerate(self.tiers):
+            entry = tier.load(key)
+            if entry is None:
+                continue
+            if time.time() - entry[0] > self.ttl:
+                tier.delete(key)
+                continue
+            # Promote into faster tiers
+            for faster in self.tiers[:i]:
+                faster.save(key, *entry)
+            return entry
+        return None
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._load(key)
+        if entry is None or len(entry[1]) < self.variants:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return random.choice(entry[1])
+
+    def add(self, key: str, value: str):
+        entry = self._load(key)
+        stored_at, variants = entry if entry else (time.time(), [])
+        variants = (variants + [value])[-self.variants:]
+        for tier in self.tiers:
+            tier.save(key, stored_at, variants)
@@ -0,0 +1,86 @@
+import importlib.util
+import logging
+import os
+import sys
+
+from services.provider_sdks import SDKS
+
+logger = logging.getLogger(__name__)
+
+# off | warn (log problems) | strict (refuse to start)
+STARTUP_SELF_CHECK = os.getenv("STARTUP_SELF_CHECK", "warn")
+
+REQUIRED = ("fastapi", "starlette", "pydantic", "uvicorn", "dotenv", "reportlab")
+
+# Large packages nothing in the server imports; if one shows up in sys.modules,
+# a dependency or stray import is bloating every worker's memory and boot time
+FORBIDDEN = ("torch", "transformers", "accelerate", "sympy", "pyarrow", "pandas", "weasyprint", "streamlit")
+
+
+def _installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def configured_providers():
+    """Providers with a server-side key in the environment."""
+    return [p for p in SDKS if os.getenv(f"{p.upper()}_API_KEY")]
+
+
+def run() -> dict:
+    """
+    Check the serving profile: required modules are installed, every
+    configured provider has its SDK (found, not imported, so loading stays
+    lazy), and no heavyweight tooling has been pulled into the process.
+
+    `cd backend && python -m services.self_check` exits non-zero on any
+    problem, so it can gate a build or deploy.
+    """
+    problems = []
+    for module in REQUIRED:
+        if not _installed(module):
+            problems.append(f"required module {module!r} is not installed (pip install -r requirements/backend.txt)")
+
+    for provider in configured_providers():
+        if not _installed(SDKS[provider].module):
+            problems.append(f"{provider.upper()}_API_KEY is set but {SDKS[provider].package} is not installed "
+                            f"(pip install -r requirements/{provider}.txt)")
+
+    store_url = os.getenv("SESSION_STORE") or ""
+    if store_url.startswith(("redis://", "rediss://", "unix://")) and not _installed("redis"):
+        problems.append("SESSION_STORE points at Redis but redis is not installed (pip install -r requirements/redis.txt)")
+
+    loaded = sorted(m for m in FORBIDDEN if m in sys.modules)
+    if loaded:
+        problems.append(f"tooling modules loaded in the server process: {', '.join(loaded)}")
+
+    return {
+        "ok": not problems,
+        "problems": problems,
+        "providers": configured_providers(),
+        "modules_loaded": len(sys.modules),
+    }
+
+
+def check_startup() -> dict:
+    """Run the check per STARTUP_SELF_CHECK; raises RuntimeError in strict mode."""
+    if STARTUP_SELF_CHECK == "off":
+        return {"ok": True, "problems": [], "skipped": True}
+    report = run()
+    for problem in report["problems"]:
+        logger.warning("Startup self-check: %s", problem)
+    if not report["ok"] and STARTUP_SELF_CHECK == "strict":
+        raise RuntimeError("Startup self-check failed: " + "; ".join(report["problems"]))
+    return report
+
+
+if __name__ == "__main__":
+    import main  # noqa: F401  (load the app exactly as uvicorn would)
+
+    result = run()
+    for line in result["problems"] or ["ok"]:
+        print(line)
+    print(f"providers: {', '.join(result['providers']) or 'none'}; modules loaded: {result['modules_loaded']}")
+    sys.exit(0 if result["ok"] else 1)
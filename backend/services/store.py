@@ -1,31 +1,796 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
 import time
-from typing import Dict
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
-class SessionStore:
-    def __init__(self):
-        self.store: Dict[str, dict] = {}
-
-    def create(self, session_id: str, meta: dict, questions: list):
-        self.store[session_id] = {
-            "meta": meta,
-            "questions": questions,
-            "answers": [],
-            "created_at": time.time(),
-            "status": "ongoing"
+from services.tracing import span
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+def _env_ttl(name: str, default: str) -> Optional[float]:
+    value = float(os.getenv(name, default))
+    return value if value > 0 else None
+
+
+def _intern(value):
+    """Share one copy of enum-like strings (mode, experience, provider, status) across sessions."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+ONGOING = _intern("ongoing")
+COMPLETED = _intern("completed")
+
+
+def _in_range(created_at: float, since: Optional[float], until: Optional[float]) -> bool:
+    return (since is None or created_at >= since) and (until is None or created_at < until)
+
+# ------------------ RECORDS ------------------
+
+@dataclass(slots=True)
+class QuestionRecord:
+    id: int
+    question: str
+    type: Optional[str] = None
+    difficulty: Optional[str] = None
+    hint: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "QuestionRecord":
+        return cls(d.get("id", 0), d.get("question", ""), _intern(d.get("type")),
+                   _intern(d.get("difficulty")), d.get("hint"))
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "question": self.question, "type": self.type,
+                "difficulty": self.difficulty, "hint": self.hint}
+
+
+@dataclass(slots=True)
+class AnswerRecord:
+    question_id: int
+    answer: str
+    scores: dict
+    feedback: str = ""
+    examples_or_corrections: Optional[str] = None
+    resources: Optional[list] = None
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "AnswerRecord":
+        ev = d.get("evaluation") or {}
+        return cls(d["question_id"], d.get("answer", ""), ev.get("scores") or {}, ev.get("feedback", ""),
+                   ev.get("examples_or_corrections"), ev.get("resources"))
+
+    @property
+    def evaluation(self) -> dict:
+        return {"question_id": self.question_id, "scores": self.scores, "feedback": self.feedback,
+                "examples_or_corrections": self.examples_or_corrections, "resources": self.resources}
+
+    def to_dict(self) -> dict:
+        return {"question_id": self.question_id, "answer": self.answer, "evaluation": self.evaluation}
+
+
+@dataclass(slots=True)
+class SessionMeta:
+    # `api_key` lives only in process memory: it is left out of `to_dict`, so it is
+    # neither returned by the API nor written to SQLite/Redis
+    role: Optional[str] = None
+    domain: Optional[str] = None
+    experience: Optional[str] = None
+    mode: Optional[str] = None
+    provider: str = "gemini"
+    model_provider: Optional[str] = None
+    api_key: Optional[str] = None
+    used_user_key: bool = False
+    masked_api_key: Optional[str] = None
+    extra: Optional[dict] = None
+
+    _FIELDS = ("role", "domain", "experience", "mode", "provider", "model_provider",
+               "api_key", "used_user_key", "masked_api_key")
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "SessionMeta":
+        extra = {k: v for k, v in d.items() if k not in cls._FIELDS} or None
+        return cls(
+            _intern(d.get("role")), d.get("domain"), _intern(d.get("experience")), _intern(d.get("mode")),
+            _intern(d.get("provider") or "gemini"), _intern(d.get("model_provider")), d.get("api_key"),
+            bool(d.get("used_user_key")), d.get("masked_api_key"), extra,
+        )
+
+    def to_dict(self) -> dict:
+        d = {"role": self.role, "domain": self.domain, "experience": self.experience, "mode": self.mode,
+             "model_provider": self.model_provider, "provider": self.provider,
+             "used_user_key": self.used_user_key, "masked_api_key": self.masked_api_key}
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+
+@dataclass(slots=True)
+class Session:
+    meta: SessionMeta
+    questions: List[QuestionRecord]
+    answers: List[AnswerRecord] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    status: str = ONGOING
+    final_report: Optional[dict] = None
+
+    @classmethod
+    def new(cls, meta: dict, questions: list) -> "Session":
+        return cls(SessionMeta.from_dict(meta), [QuestionRecord.from_dict(q) for q in questions])
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Session":
+        return cls(
+            SessionMeta.from_dict(d["meta"]),
+            [QuestionRecord.from_dict(q) for q in d["questions"]],
+            [AnswerRecord.from_dict(a) for a in d.get("answers", [])],
+            d["created_at"],
+            _intern(d.get("status", ONGOING)),
+            d.get("final_report"),
+        )
+
+    def question(self, question_id: int) -> Optional[QuestionRecord]:
+        return next((q for q in self.questions if q.id == question_id), None)
+
+    def latest_answer(self, question_id: int) -> Optional[AnswerRecord]:
+        return next((a for a in reversed(self.answers) if a.question_id == question_id), None)
+
+    def to_dict(self) -> dict:
+        """Plain-dict form in the shape the API has always returned."""
+        d = {
+            "meta": self.meta.to_dict(),
+            "questions": [q.to_dict() for q in self.questions],
+            "answers": [a.to_dict() for a in self.answers],
+            "created_at": self.created_at,
+            "status": self.status,
         }
+        if self.final_report is not None:
+            d["final_report"] = self.final_report
+        return d
+
+    def to_json(self) -> bytes:
+        # Hand-built dicts + json.dumps skip the recursive jsonable_encoder pass
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ------------------ BACKENDS ------------------
+
+class _Limits:
+    """TTL and size limits shared by every backend."""
+
+    ttl_ongoing: Optional[float] = None
+    ttl_completed: Optional[float] = None
+    max_sessions: Optional[int] = None
+    # Which sessions go when over `max_sessions`; None if the backend doesn't enforce it
+    cap_policy: Optional[str] = None
+
+    def set_limits(self, ttl_ongoing=None, ttl_completed=None, max_sessions=None):
+        self.ttl_ongoing = ttl_ongoing
+        self.ttl_completed = ttl_completed
+        self.max_sessions = max_sessions
+
+    def expires_at(self, session: Session) -> Optional[float]:
+        ttl = self.ttl_completed if session.status == COMPLETED else self.ttl_ongoing
+        return session.created_at + ttl if ttl else None
+
+
+class MemoryBackend(_Limits):
+    """
+    Single-process dict; sessions are lost on restart and not shared between workers.
+
+    Sessions are kept in LRU order for the `max_sessions` cap, and a heap of
+    (expiry, session_id) derived from `created_at` lets `sweep` drop expired
+    sessions without scanning the whole store. Heap entries left behind by
+    finalize or LRU eviction are discarded when they surface, and the heap is
+    rebuilt from the live sessions once stale entries outnumber them, so it
+    stays proportional to the store under heavy churn.
+    """
+
+    durable = False
+    cap_policy = "lru"
+
+    def __init__(self):
+        self.store: "OrderedDict[str, Session]" = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.evictions = {"expired": 0, "lru": 0}
+
+    def _track(self, session_id: str, session: Session):
+        expires = self.expires_at(session)
+        if expires is not None:
+            heapq.heappush(self._expiry, (expires, session_id))
+        if len(self._expiry) > 2 * len(self.store) + 64:
+            self._rebuild_expiry()
+
+    def _rebuild_expiry(self):
+        live = ((self.expires_at(s), sid) for sid, s in self.store.items())
+        self._expiry = [entry for entry in live if entry[0] is not None]
+        heapq.heapify(self._expiry)
+
+    def get(self, session_id: str):
+        with self._lock:
+            session = self.store.get(session_id)
+            if session is None:
+                return None
+            expires = self.expires_at(session)
+            if expires is not None and expires <= time.time():
+                del self.store[session_id]
+                self.evictions["expired"] += 1
+                return None
+            self.store.move_to_end(session_id)
+            return session
+
+    def apply(self, ops: List[Tuple[str, str, object]]):
+        with self._lock:
+            for op, session_id, payload in ops:
+                if op == "create":
+                    self.store[session_id] = payload
+                    self.store.move_to_end(session_id)
+                    self._track(session_id, payload)
+                    while self.max_sessions and len(self.store) > self.max_sessions:
+                        self.store.popitem(last=False)
+                        self.evictions["lru"] += 1
+                    continue
+                session = self.store.get(session_id)
+                if session is None:
+                    continue
+                if op == "answer":
+                    session.answers.append(payload)
+                elif op == "finalize":
+                    session.final_report = payload
+                    session.status = COMPLETED
+                    self._track(session_id, session)
+
+    def sweep(self, now: float) -> int:
+        evicted = 0
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                _, session_id = heapq.heappop(self._expiry)
+                session = self.store.get(session_id)
+                if session is None:
+                    continue
+                expires = self.expires_at(session)
+                if expires is not None and expires <= now:
+                    del self.store[session_id]
+                    evicted += 1
+            self.evictions["expired"] += evicted
+        return evicted
+
+    def completed_ids(self, since: Optional[float] = None, until: Optional[float] = None) -> List[str]:
+        with self._lock:
+            found = [(s.created_at, sid) for sid, s in self.store.items()
+                     if s.status == COMPLETED and _in_range(s.created_at, since, until)]
+        return [sid for _, sid in sorted(found)]
+
+    def __len__(self):
+        return len(self.store)
+
+
+class SQLiteBackend(_Limits):
+    """
+    SQLite in WAL mode, safe for several uvicorn workers on one host.
+
+    Answers live in their own table so appends from different workers
+    never race on a read-modify-write of the session row. Reads are not
+    tracked, so the `max_sessions` cap drops the oldest sessions by
+    `created_at` rather than the least recently used.
+    """
+
+    durable = True
+    cap_policy = "oldest"
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY, meta TEXT, questions TEXT, created_at REAL,
+                    status TEXT, final_report TEXT)"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS answers (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT, body TEXT)"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS answers_session ON answers (session_id, seq)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_created ON sessions (status, created_at)")
+        self.evictions = {"expired": 0, "oldest": 0}
+
+    def get(self, session_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT meta, questions, created_at, status, final_report FROM sessions WHERE id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            answers = self._conn.execute(
+                "SELECT body FROM answers WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        return Session(
+            SessionMeta.from_dict(json.loads(row[0])),
+            [QuestionRecord.from_dict(q) for q in json.loads(row[1])],
+            [AnswerRecord.from_dict(json.loads(a[0])) for a in answers],
+            row[2],
+            _intern(row[3]),
+            json.loads(row[4]) if row[4] is not None else None,
+        )
+
+    def apply(self, ops: List[Tuple[str, str, object]]):
+        # One transaction per batch keeps fsyncs off the per-request path
+        with self._lock, self._conn:
+            for op, session_id, payload in ops:
+                if op == "create":
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sessions (id, meta, questions, created_at, status) VALUES (?, ?, ?, ?, ?)",
+                        (session_id, json.dumps(payload.meta.to_dict()),
+                         json.dumps([q.to_dict() for q in payload.questions]),
+                         payload.created_at, payload.status),
+                    )
+                elif op == "answer":
+                    self._conn.execute(
+                        "INSERT INTO answers (session_id, body) VALUES (?, ?)", (session_id, json.dumps(payload.to_dict()))
+                    )
+                elif op == "finalize":
+                    self._conn.execute(
+                        "UPDATE sessions SET final_report = ?, status = 'completed' WHERE id = ?",
+                        (json.dumps(payload), session_id),
+                    )
+
+    def _delete_where(self, where: str, params=()) -> int:
+        ids = f"SELECT id FROM sessions WHERE {where}"
+        self._conn.execute(f"DELETE FROM answers WHERE session_id IN ({ids})", params)
+        return self._conn.execute(f"DELETE FROM sessions WHERE id IN ({ids})", params).rowcount
+
+    def sweep(self, now: float) -> int:
+        # Range deletes on the (status, created_at) index, never a full scan
+        with self._lock, self._conn:
+            expired = 0
+            for status, ttl in (("ongoing", self.ttl_ongoing), ("completed", self.ttl_completed)):
+                if ttl:
+                    expired += self._delete_where("status = ? AND created_at < ?", (status, now - ttl))
+            oldest = 0
+            if self.max_sessions:
+                oldest = self._delete_where(
+                    "id IN (SELECT id FROM sessions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_sessions,),
+                )
+        self.evictions["expired"] += expired
+        self.evictions["oldest"] += oldest
+        return expired + oldest
+
+    def completed_ids(self, since: Optional[float] = None, until: Optional[float] = None) -> List[str]:
+        # Range scan on the (status, created_at) index
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM sessions WHERE status = 'completed' AND created_at >= ? AND created_at < ? "
+                "ORDER BY created_at",
+                (since if since is not None else float("-inf"), until if until is not None else float("inf")),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class RedisBackend(_Limits):
+    """
+    Backend for anything speaking the Redis protocol (Redis, Valkey, KeyDB...).
+
+    Each session is a hash plus an answers list. Pass `client` to run against
+    a local stand-in such as fakeredis. TTLs are enforced by the server via
+    EXPIRE (completed sessions get a fresh `ttl_completed` at finalize).
+    `max_sessions` is not enforced; bound total size with the server's
+    maxmemory policy.
+    """
+
+    durable = True
+
+    def __init__(self, url: str = "redis://localhost:6379/0", client=None, prefix: str = "interview:"):
+        if client is None:
+            if not redis:
+                raise ImportError("redis package not installed. Run: pip install redis")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        # Expiry happens inside Redis and isn't counted here
+        self.evictions = {}
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}session:{session_id}"
 
     def get(self, session_id: str):
-        return self.store.get(session_id)
+        key = self._key(session_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(key)
+        pipe.lrange(f"{key}:answers", 0, -1)
+        fields, answers = pipe.execute()
+        if not fields:
+            return None
+        fields = {k.decode() if isinstance(k, bytes) else k: v for k, v in fields.items()}
+        status = fields["status"].decode() if isinstance(fields["status"], bytes) else fields["status"]
+        return Session(
+            SessionMeta.from_dict(json.loads(fields["meta"])),
+            [QuestionRecord.from_dict(q) for q in json.loads(fields["questions"])],
+            [AnswerRecord.from_dict(json.loads(a)) for a in answers],
+            float(fields["created_at"]),
+            _intern(status),
+            json.loads(fields["final_report"]) if "final_report" in fields else None,
+        )
+
+    def apply(self, ops: List[Tuple[str, str, object]]):
+        # One round trip per batch
+        pipe = self.client.pipeline(transaction=False)
+        for op, session_id, payload in ops:
+            key = self._key(session_id)
+            if op == "create":
+                pipe.hset(key, mapping={
+                    "meta": json.dumps(payload.meta.to_dict()),
+                    "questions": json.dumps([q.to_dict() for q in payload.questions]),
+                    "created_at": payload.created_at,
+                    "status": payload.status,
+                })
+                if self.ttl_ongoing:
+                    pipe.pexpire(key, int(self.ttl_ongoing * 1000))
+            elif op == "answer":
+                pipe.rpush(f"{key}:answers", json.dumps(payload.to_dict()))
+                if self.ttl_ongoing:
+                    pipe.pexpire(f"{key}:answers", int(self.ttl_ongoing * 1000))
+            elif op == "finalize":
+                pipe.hset(key, mapping={"final_report": json.dumps(payload), "status": "completed"})
+                if self.ttl_completed:
+                    pipe.pexpire(key, int(self.ttl_completed * 1000))
+                    pipe.pexpire(f"{key}:answers", int(self.ttl_completed * 1000))
+        pipe.execute()
+
+    def sweep(self, now: float) -> int:
+        return 0
+
+    def completed_ids(self, since: Optional[float] = None, until: Optional[float] = None) -> List[str]:
+        # O(n) SCAN plus one pipelined HMGET per page of keys
+        keys = [k.decode() if isinstance(k, bytes) else k for k in self.client.scan_iter(f"{self.prefix}session:*")]
+        keys = [k for k in keys if not k.endswith(":answers")]
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(key, "status", "created_at")
+        found = []
+        for key, (status, created_at) in zip(keys, pipe.execute()):
+            if status is None or created_at is None:
+                continue
+            status = status.decode() if isinstance(status, bytes) else status
+            created_at = float(created_at)
+            if status == COMPLETED and _in_range(created_at, since, until):
+                found.append((created_at, key[len(self._key("")):]))
+        return [sid for _, sid in sorted(found)]
+
+    def __len__(self):
+        # O(n) SCAN; only used for stats
+        keys = (k.decode() if isinstance(k, bytes) else k for k in self.client.scan_iter(f"{self.prefix}session:*"))
+        return sum(1 for k in keys if not k.endswith(":answers"))
+
+
+def backend_from_url(url: Optional[str]):
+    """memory (default), sqlite:///path/to/sessions.db or redis://host:port/db."""
+    if not url or url == "memory":
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported SESSION_STORE: {url}")
+
+
+# ------------------ STORE ------------------
+
+class SessionStore:
+    """
+    Session store over a pluggable backend.
+
+    For durable backends, writes are buffered and applied in batches by a
+    flusher thread every `flush_interval` seconds (or once `batch_size` ops
+    are pending), and reads go through an in-process cache. Local writes
+    update the cache immediately; writes from other workers become visible
+    once an ongoing session's cache entry is older than `read_cache_ttl`.
+    Completed sessions never change, so they stay cached.
+
+    Sessions expire `ttl_ongoing`/`ttl_completed` seconds after creation and
+    the store holds at most `max_sessions` (least recently used go first in
+    memory, oldest first in SQLite; Redis leaves size to its maxmemory
+    policy); a sweeper thread enforces both every `sweep_interval` seconds.
+
+    Durable backends never see a user's API key: it is kept in a
+    process-local map and put back on sessions read from the backend. A
+    worker that didn't create the session falls back to the .env key.
+
+    Request handlers use the `a*` methods, which run backend I/O in a
+    thread so SQLite and Redis round trips don't block the event loop.
+    For the same reason `stats` reports a durable backend's session count
+    as of the sweeper's last pass rather than counting on every call.
+    """
+
+    def __init__(self, backend=None, read_cache_ttl: float = None, flush_interval: float = None,
+                 batch_size: int = 64, cache_size: int = 4096,
+                 ttl_ongoing: float = None, ttl_completed: float = None, max_sessions: int = None,
+                 sweep_interval: float = None):
+        self.backend = backend if backend is not None else backend_from_url(os.getenv("SESSION_STORE"))
+        self.backend.set_limits(
+            ttl_ongoing if ttl_ongoing is not None else _env_ttl("SESSION_TTL_ONGOING", "21600"),
+            ttl_completed if ttl_completed is not None else _env_ttl("SESSION_TTL_COMPLETED", "86400"),
+            max_sessions if max_sessions is not None else int(os.getenv("SESSION_MAX", "10000")) or None,
+        )
+        self.sweep_interval = sweep_interval if sweep_interval is not None else float(
+            os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+        self.read_cache_ttl = read_cache_ttl if read_cache_ttl is not None else float(
+            os.getenv("SESSION_CACHE_TTL", "1.0"))
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv("SESSION_FLUSH_INTERVAL", "0.05"))
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[str, Tuple[float, Session]]" = OrderedDict()
+        # session_id -> (created_at, api_key) for durable backends; never persisted
+        self._api_keys: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._pending: List[Tuple[str, str, object]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._session_count = 0  # durable backends: refreshed by the sweeper thread
+        self._flusher = None
+        if self.backend.durable:
+            self._flusher = threading.Thread(target=self._flush_loop, name="session-flush", daemon=True)
+            self._flusher.start()
+        self._stop_sweep = threading.Event()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="session-sweep", daemon=True)
+        self._sweeper.start()
+
+    @property
+    def store(self) -> Dict[str, Session]:
+        """Raw session dict of the in-memory backend."""
+        return self.backend.store
+
+    # ---- writes ----
 
-    def save_answer(self, session_id: str, answer_obj: dict):
-        session = self.store.get(session_id)
+    def _write(self, op: str, session_id: str, payload):
+        with span("store.write", op=op, backend=type(self.backend).__name__):
+            if not self.backend.durable:
+                self.backend.apply([(op, session_id, payload)])
+                return
+            with self._lock:
+                self._pending.append((op, session_id, payload))
+                if len(self._pending) >= self.batch_size:
+                    self._wake.set()
+
+    def create(self, session_id: str, meta: dict, questions: list) -> Session:
+        session = Session.new(meta, questions)
+        self._write("create", session_id, session)
+        if self.backend.durable:
+            if session.meta.api_key:
+                self._remember_key(session_id, session)
+            self._cache_put(session_id, session)
+        return session
+
+    def save_answer(self, session_id: str, answer_obj):
+        """Append an answer, given as an AnswerRecord or its dict form."""
+        self._append_answer(session_id, self.get(session_id), answer_obj)
+
+    async def asave_answer(self, session_id: str, answer_obj):
+        self._append_answer(session_id, await self.aget(session_id), answer_obj)
+
+    def _append_answer(self, session_id: str, session: Optional[Session], answer_obj):
         if not session:
             raise KeyError("Session not found")
-        session["answers"].append(answer_obj)
+        if isinstance(answer_obj, dict):
+            answer_obj = AnswerRecord.from_dict(answer_obj)
+        self._write("answer", session_id, answer_obj)
+        if self.backend.durable:
+            session.answers.append(answer_obj)
 
     def finalize(self, session_id: str, report: dict):
-        session = self.store.get(session_id)
+        self._finalize(session_id, self.get(session_id), report)
+
+    async def afinalize(self, session_id: str, report: dict):
+        self._finalize(session_id, await self.aget(session_id), report)
+
+    def _finalize(self, session_id: str, session: Optional[Session], report: dict):
         if not session:
             raise KeyError("Session not found")
-        session["final_report"] = report
-        session["status"] = "completed"
+        self._write("finalize", session_id, report)
+        if self.backend.durable:
+            session.final_report = report
+            session.status = COMPLETED
+
+    # ---- api keys ----
+
+    def _remember_key(self, session_id: str, session: Session):
+        with self._lock:
+            self._api_keys[session_id] = (session.created_at, session.meta.api_key)
+            while self.backend.max_sessions and len(self._api_keys) > self.backend.max_sessions:
+                self._api_keys.popitem(last=False)
+
+    def _forget_expired_keys(self, now: float):
+        ttl = max(self.backend.ttl_ongoing or 0, self.backend.ttl_completed or 0)
+        if not ttl:
+            return
+        with self._lock:
+            # Insertion order is creation order, so expired keys are at the front
+            while self._api_keys:
+                session_id, (created_at, _) = next(iter(self._api_keys.items()))
+                if created_at + ttl > now:
+                    break
+                del self._api_keys[session_id]
+
+    # ---- reads ----
+
+    def get(self, session_id: str, fresh: bool = False) -> Optional[Session]:
+        """Return a session; `fresh=True` skips the read cache for ongoing sessions."""
+        with span("store.get", backend=type(self.backend).__name__):
+            return self._get(session_id, fresh)
+
+    async def aget(self, session_id: str, fresh: bool = False) -> Optional[Session]:
+        """`get` for async callers: cache hits return inline, backend reads run in a thread."""
+        if self.backend.durable:
+            hit, session = self._from_cache(session_id, fresh)
+            if not hit:
+                return await asyncio.to_thread(self.get, session_id, fresh)
+            return session
+        return self.get(session_id, fresh)
+
+    def _from_cache(self, session_id: str, fresh: bool) -> Tuple[bool, Optional[Session]]:
+        """(hit, session) from the read cache; a miss means the backend must be asked."""
+        cached = self._cache.get(session_id)
+        if cached is None:
+            return False, None
+        cached_at, session = cached
+        expires = self.backend.expires_at(session)
+        if expires is not None and expires <= time.time():
+            self._cache.pop(session_id, None)
+            return True, None
+        if session.status == COMPLETED or (
+                not fresh and time.monotonic() - cached_at <= self.read_cache_ttl):
+            return True, session
+        return False, None
+
+    def _get(self, session_id: str, fresh: bool) -> Optional[Session]:
+        if not self.backend.durable:
+            return self.backend.get(session_id)
+
+        hit, session = self._from_cache(session_id, fresh)
+        if hit:
+            return session
+
+        # Make our own buffered writes visible before reading back
+        if self._pending:
+            self.flush()
+        session = self.backend.get(session_id)
+        if session is None:
+            self._cache.pop(session_id, None)
+        else:
+            key = self._api_keys.get(session_id)
+            session.meta.api_key = key[1] if key else None
+            self._cache_put(session_id, session)
+        return session
+
+    def _cache_put(self, session_id: str, session: Session):
+        self._cache[session_id] = (time.monotonic(), session)
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def afind_completed(self, since: Optional[float] = None, until: Optional[float] = None,
+                              limit: Optional[int] = None, **meta) -> List[str]:
+        return await asyncio.to_thread(self.find_completed, since, until, limit, **meta)
+
+    def find_completed(self, since: Optional[float] = None, until: Optional[float] = None,
+                       limit: Optional[int] = None, **meta) -> List[str]:
+        """
+        Ids of completed sessions, oldest first, created in [since, until).
+
+        Keyword arguments filter on meta fields (role, domain, experience,
+        mode), compared case-insensitively.
+        """
+        if self.backend.durable and self._pending:
+            self.flush()
+        wanted = {k: v.lower() for k, v in meta.items() if v}
+        found = []
+        for session_id in self.backend.completed_ids(since, until):
+            if wanted:
+                session = self.get(session_id)
+                if session is None or any((getattr(session.meta, k) or "").lower() != v for k, v in wanted.items()):
+                    continue
+            found.append(session_id)
+            if limit and len(found) >= limit:
+                break
+        return found
+
+    # ---- eviction ----
+
+    def sweep(self) -> int:
+        """Evict expired (and, for SQLite, over-cap) sessions; returns how many."""
+        now = time.time()
+        if self.backend.durable:
+            if self._pending:
+                self.flush()
+            self._forget_expired_keys(now)
+        return self.backend.sweep(now)
+
+    def _count_sessions(self):
+        # COUNT(*) on SQLite, a full SCAN on Redis: only ever run on the sweeper thread
+        if self.backend.durable:
+            self._session_count = len(self.backend)
+
+    def _sweep_loop(self):
+        try:
+            self._count_sessions()
+        except Exception:
+            logger.exception("Session count failed")
+        while not self._stop_sweep.wait(self.sweep_interval):
+            try:
+                self.sweep()
+                self._count_sessions()
+            except Exception:
+                logger.exception("Session sweep failed")
+
+    def stats(self) -> dict:
+        stats = {
+            "sessions": self._session_count if self.backend.durable else len(self.backend),
+            "cached_sessions": len(self._cache),
+            "pending_writes": len(self._pending),
+            # None: SESSION_MAX is ignored and size is up to the backend's server (Redis maxmemory)
+            "max_sessions": self.backend.max_sessions if self.backend.cap_policy else None,
+            "cap_policy": self.backend.cap_policy,
+        }
+        for reason, count in self.backend.evictions.items():
+            stats[f"evicted_{reason}"] = count
+        return stats
+
+    # ---- flushing ----
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                ops, self._pending = self._pending, []
+            if not ops:
+                return
+            try:
+                self.backend.apply(ops)
+            except Exception:
+                logger.exception("Session store flush failed; will retry %d ops", len(ops))
+                with self._lock:
+                    self._pending = ops + self._pending
+                raise
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(self.flush_interval)
+
+    def close(self):
+        """Stop background threads and write out anything still buffered."""
+        self._stop_sweep.set()
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+        if self.backend.durable:
+            self.flush()
@@ -0,0 +1,342 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Span of the code currently running; children attach to it
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("span", default=None)
+
+
+def _hex_id(nbytes: int) -> str:
+    return f"{random.getrandbits(nbytes * 8):0{nbytes * 2}x}"
+
+
+class Span:
+    """One timed stage of a sampled request; use as a context manager."""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "attrs",
+                 "start_ns", "_started", "duration", "error", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str], attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _hex_id(8)
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.start_ns = 0
+        self._started = 0.0
+        self.duration = 0.0
+        self.error = None
+        self._token = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        # Wall clock only anchors the span; its duration comes from the monotonic clock
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.error = f"{exc_type.__name__}: {exc}"
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Exited from another context (e.g. a generator finished elsewhere)
+            pass
+        self.tracer.exporter.export(self.to_dict())
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in for unsampled requests, so callers never branch on sampling."""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP = _NoopSpan()
+
+
+# ---- exporters ----
+
+class BatchExporter:
+    """
+    Hands finished spans to a background thread that writes them in batches.
+
+    `export` never blocks the request: when the buffer is full the span is
+    dropped and counted. Subclasses implement `write(batch)`.
+    """
+
+    def __init__(self, max_batch: int = 256, interval: float = 1.0, max_queue: int = 10000):
+        self.max_batch = max_batch
+        self.interval = interval
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {"exported": 0, "dropped": 0, "errors": 0}
+
+    def export(self, record: dict):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch: List[dict] = []
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: List[dict]):
+        try:
+            self.write(batch)
+            self.stats["exported"] += len(batch)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning("Dropped %d spans: %s", len(batch), e)
+
+    def write(self, batch: List[dict]):
+        raise NotImplementedError
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush what is buffered and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+
+class JsonlExporter(BatchExporter):
+    """Appends one JSON object per span to a local file."""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+
+    def write(self, batch: List[dict]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in batch)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(batch: List[dict], service: str) -> dict:
+    """OTLP/HTTP JSON body (ExportTraceServiceRequest) for a batch of span records."""
+    spans = []
+    for r in batch:
+        span = {
+            "traceId": r["trace_id"],
+            "spanId": r["span_id"],
+            "name": r["name"],
+            "kind": 2 if "http.method" in r["attrs"] else 1,  # SERVER for request spans, INTERNAL otherwise
+            "startTimeUnixNano": str(r["start_ns"]),
+            "endTimeUnixNano": str(r["start_ns"] + int(r["duration_ms"] * 1e6)),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in r["attrs"].items()],
+            "status": {"code": 2, "message": r["error"]} if r["error"] else {"code": 1},
+        }
+        if r["parent_id"]:
+            span["parentSpanId"] = r["parent_id"]
+        spans.append(span)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+        "scopeSpans": [{"scope": {"name": "interviprep.tracing"}, "spans": spans}],
+    }]}
+
+
+class OtlpExporter(BatchExporter):
+    """POSTs batches as OTLP/HTTP JSON to a collector, e.g. http://localhost:4318/v1/traces."""
+
+    def __init__(self, endpoint: str, service: str = "interviprep-backend", timeout: float = 5.0, **kwargs):
+        super().__init__(**kwargs)
+        self.endpoint = endpoint
+        self.service = service
+        self.timeout = timeout
+
+    def write(self, batch: List[dict]):
+        body = json.dumps(otlp_payload(batch, self.service)).encode()
+        req = urllib.request.Request(self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            resp.read()
+
+
+class NullExporter:
+    stats: Dict[str, int] = {}
+
+    def export(self, record: dict):
+        pass
+
+    def shutdown(self, timeout: float = 5.0):
+        pass
+
+
+# ---- tracer ----
+
+def parse_traceparent(header: Optional[str]):
+    """(trace_id, parent_span_id, sampled) from a W3C traceparent header, or None."""
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class Tracer:
+    """
+    Samples whole requests and times their stages as nested spans.
+
+    The sampling decision is made once at the root (`trace`); `span` only
+    records when an enclosing sampled span exists in the current context, so
+    unsampled requests pay a single contextvar lookup per stage. Spans follow
+    the request into executor threads through `deadline.bind`'s copied context.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, exporter=None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter or NullExporter()
+        self.enabled = sample_rate > 0 and exporter is not None
+
+    def trace(self, name: str, traceparent: Optional[str] = None, **attrs):
+        """Root span for a request, or NOOP when the request is not sampled."""
+        if not self.enabled:
+            return NOOP
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = _hex_id(16), None
+            sampled = random.random() < self.sample_rate
+        if not sampled:
+            return NOOP
+        return Span(self, name, trace_id, parent_id, attrs)
+
+    def span(self, name: str, **attrs):
+        parent = _current.get()
+        if parent is None:
+            return NOOP
+        return Span(self, name, parent.trace_id, parent.span_id, attrs)
+
+    def shutdown(self):
+        self.exporter.shutdown()
+
+
+def build_exporter(spec: str):
+    """TRACE_EXPORT: jsonl:PATH or otlp:URL."""
+    kind, _, target = spec.partition(":")
+    if kind == "jsonl":
+        return JsonlExporter(target or "traces.jsonl")
+    if kind == "otlp":
+        return OtlpExporter(target or "http://localhost:4318/v1/traces")
+    raise ValueError(f"Unknown trace exporter: {spec}")
+
+
+def build_tracer() -> Tracer:
+    rate = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    if rate <= 0:
+        return Tracer()
+    return Tracer(rate, build_exporter(os.getenv("TRACE_EXPORT", "jsonl:traces.jsonl")))
+
+
+tracer = build_tracer()
+span = tracer.span
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening the root span of each sampled request.
+
+    The span is named by route template once routing has happened, honours an
+    incoming `traceparent` header and returns the trace id as X-Trace-Id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent", b"").decode("latin-1") or None
+        root = tracer.trace(scope["method"], traceparent, **{"http.method": scope["method"]})
+        if root is NOOP:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set(**{"http.status_code": message["status"]})
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-trace-id", root.trace_id.encode())]
+            await send(message)
+
+        with root:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                path = getattr(scope.get("route"), "path", None) or "unmatched"
+                root.name = f"{scope['method']} {path}"
+                root.set(**{"http.route": path})
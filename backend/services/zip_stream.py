@@ -0,0 +1,53 @@
+import io
+import time
+import zipfile
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable target that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipStream:
+    """
+    Builds a ZIP archive incrementally without holding it in memory.
+
+    Each `add` writes one entry and returns the archive bytes it produced,
+    ready to send; `close` returns the central directory. Because the sink
+    cannot seek, zipfile emits data descriptors after each entry, so only
+    the entry being written is ever buffered.
+    """
+
+    def __init__(self):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, "w")
+
+    def add(self, name: str, data: bytes, compress: bool = False) -> bytes:
+        # PDFs are already deflated internally, so store them as-is by default
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._zip.writestr(info, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._sink.drain()
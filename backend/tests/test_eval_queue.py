@@ -0,0 +1,61 @@
+"""
+EvaluationQueue resubmission rules.
+
+Run from backend/:
+
+    python -m pytest tests
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.eval_queue import EvaluationQueue, JobRunning  # noqa: E402
+
+
+def run_queue(scenario):
+    saved = []
+
+    async def evaluate(question, answer, mode, experience, **_):
+        await asyncio.sleep(0.05)
+        return {"question_id": question["id"], "scores": {}, "feedback": answer}
+
+    async def on_result(session_id, answer_obj):
+        saved.append((answer_obj["question_id"], answer_obj["answer"]))
+
+    async def main():
+        queue = EvaluationQueue(evaluate, on_result, concurrency=1)
+        try:
+            await scenario(queue)
+            await asyncio.sleep(0.3)
+        finally:
+            await queue.stop()
+
+    asyncio.run(main())
+    return saved
+
+
+def test_resubmitting_a_queued_job_replaces_its_answer():
+    async def scenario(queue):
+        queue.submit("s", {"id": 1}, "first", "technical", "1-3")
+        job = queue.submit("s", {"id": 2}, "draft", "technical", "1-3")
+        # Question 2 waits behind question 1 on the single worker
+        assert queue.submit("s", {"id": 2}, "final", "technical", "1-3") is job
+
+    assert run_queue(scenario) == [(1, "first"), (2, "final")]
+
+
+def test_resubmitting_a_running_job_is_refused():
+    async def scenario(queue):
+        queue.submit("s", {"id": 1}, "first", "technical", "1-3")
+        await asyncio.sleep(0.01)
+        assert queue.status("s", 1)["status"] == "running"
+        with pytest.raises(JobRunning):
+            queue.submit("s", {"id": 1}, "second", "technical", "1-3")
+
+    assert run_queue(scenario) == [(1, "first")]
@@ -0,0 +1,48 @@
+"""
+ResponseCache variety policy.
+
+Run from backend/:
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.response_cache import MemoryTier, ResponseCache, SQLiteTier, cache_key  # noqa: E402
+
+
+def test_repeated_output_fills_the_quota(tmp_path):
+    # A low-temperature model answering the same way every time must still start hitting
+    cache = ResponseCache([MemoryTier(), SQLiteTier(str(tmp_path / "responses.db"))], variants=3)
+    key = cache_key("prompt", "gemini", "model")
+    for _ in range(3):
+        assert cache.get(key) is None
+        cache.add(key, "same")
+    for _ in range(7):
+        assert cache.get(key) == "same"
+    assert cache.stats == {"hits": 7, "misses": 3}
+
+
+def test_keeps_the_latest_variants():
+    cache = ResponseCache([MemoryTier()], variants=2)
+    for value in ("a", "b", "c"):
+        cache.add("k", value)
+    assert {cache.get("k") for _ in range(50)} == {"b", "c"}
+
+
+def test_generate_questions_hits_on_deterministic_output(monkeypatch):
+    from services import openai_service
+
+    cache = ResponseCache([MemoryTier()], variants=3)
+    monkeypatch.setattr(openai_service, "question_cache", cache)
+    monkeypatch.setattr(
+        openai_service, "_generate_response",
+        lambda prompt, **kwargs: '[{"id": 1, "question": "Why?", "type": "technical", "difficulty": "easy"}]',
+    )
+    for _ in range(5):
+        openai_service.generate_questions("SE", "", "1-3", "technical", num=1, api_key="k")
+    assert cache.stats == {"hits": 2, "misses": 3}
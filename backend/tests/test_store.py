@@ -0,0 +1,159 @@
+"""
+SessionStore over the durable backends: SQLite on a temp file and Redis
+through fakeredis (requirements/dev.txt), so no server is needed.
+
+Run from backend/:
+
+    python -m pytest tests
+"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.store import COMPLETED, RedisBackend, SessionStore, SQLiteBackend  # noqa: E402
+
+QUESTIONS = [{"id": 1, "question": "Why?", "type": "technical", "difficulty": "easy"}]
+
+
+def meta(role="SE", api_key=None):
+    return {"role": role, "domain": "", "experience": "1-3", "mode": "technical", "api_key": api_key}
+
+
+def answer(question_id=1):
+    return {"question_id": question_id, "answer": "Because",
+            "evaluation": {"scores": {"technical": 7, "communication": 6, "confidence": 5}, "feedback": "ok"}}
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_store(request, tmp_path):
+    """Factory for stores that share one backend, like uvicorn workers on one host."""
+    if request.param == "sqlite":
+        path = str(tmp_path / "sessions.db")
+        new_backend = lambda: SQLiteBackend(path)  # noqa: E731
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        new_backend = lambda: RedisBackend(client=fakeredis.FakeRedis(server=server))  # noqa: E731
+
+    stores = []
+
+    def make(**kwargs):
+        # Long intervals keep the background threads out of the way; tests flush explicitly
+        kwargs.setdefault("flush_interval", 3600)
+        kwargs.setdefault("sweep_interval", 3600)
+        kwargs.setdefault("read_cache_ttl", 3600)
+        store = SessionStore(backend=new_backend(), **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def test_writes_are_buffered_until_flush(make_store):
+    store = make_store()
+    store.create("s1", meta(), QUESTIONS)
+    store.save_answer("s1", answer())
+
+    assert store.backend.get("s1") is None
+    assert store.stats()["pending_writes"] == 2
+    # The writer sees its own buffered writes
+    assert len(store.get("s1").answers) == 1
+
+    store.flush()
+    persisted = store.backend.get("s1")
+    assert persisted is not None and len(persisted.answers) == 1
+    assert store.stats()["pending_writes"] == 0
+
+
+def test_api_key_is_not_persisted(make_store):
+    store = make_store()
+    store.create("s1", meta(api_key="sk-user-secret"), QUESTIONS)
+    store.flush()
+
+    assert store.backend.get("s1").meta.api_key is None
+    if isinstance(store.backend, SQLiteBackend):
+        raw = store.backend._conn.execute("SELECT meta FROM sessions WHERE id = 's1'").fetchone()[0]
+    else:
+        raw = store.backend.client.hget(store.backend._key("s1"), "meta")
+    assert "sk-user-secret" not in (raw.decode() if isinstance(raw, bytes) else raw)
+    assert "api_key" not in json.loads(raw)
+
+    # The creating worker puts the key back on reads; another worker has none
+    assert store.get("s1", fresh=True).meta.api_key == "sk-user-secret"
+    assert make_store().get("s1").meta.api_key is None
+
+
+def test_read_cache_refreshes_ongoing_sessions(make_store):
+    writer, reader = make_store(), make_store()
+    writer.create("s1", meta(), QUESTIONS)
+    writer.flush()
+    assert reader.get("s1").answers == []
+
+    writer.save_answer("s1", answer())
+    writer.flush()
+    # Still within read_cache_ttl: the reader serves its cached copy
+    assert reader.get("s1").answers == []
+    assert len(reader.get("s1", fresh=True).answers) == 1
+
+    writer.save_answer("s1", answer())
+    writer.flush()
+    reader.read_cache_ttl = 0
+    assert len(reader.get("s1").answers) == 2
+
+
+def test_completed_sessions_stay_cached(make_store):
+    writer, reader = make_store(read_cache_ttl=0), make_store(read_cache_ttl=0)
+    writer.create("s1", meta(), QUESTIONS)
+    writer.save_answer("s1", answer())
+    writer.finalize("s1", {"overall_score": 6.5})
+    writer.flush()
+
+    session = reader.get("s1")
+    assert session.status == COMPLETED and session.final_report == {"overall_score": 6.5}
+    assert reader.get("s1") is session
+
+
+def test_completed_ids_and_find_completed(make_store):
+    store = make_store()
+    for i, role in enumerate(["SE", "Data Scientist", "SE"]):
+        store.create(f"s{i}", meta(role=role), QUESTIONS)
+        time.sleep(0.01)
+    store.finalize("s2", {"overall_score": 7})
+    store.finalize("s0", {"overall_score": 5})
+    store.finalize("s1", {"overall_score": 6})
+    store.flush()
+
+    # Oldest first, whatever the order they were finalized in
+    assert store.backend.completed_ids() == ["s0", "s1", "s2"]
+    assert store.find_completed(role="se") == ["s0", "s2"]
+    assert store.find_completed(limit=2) == ["s0", "s1"]
+    since = store.get("s1").created_at
+    assert store.find_completed(since=since) == ["s1", "s2"]
+    assert store.find_completed(until=since) == ["s0"]
+
+
+def test_find_completed_flushes_pending_writes(make_store):
+    store = make_store()
+    store.create("s1", meta(), QUESTIONS)
+    store.finalize("s1", {"overall_score": 5})
+    assert store.find_completed() == ["s1"]
+
+
+def test_ongoing_sessions_expire(make_store):
+    store = make_store(ttl_ongoing=0.2)
+    store.create("s1", meta(), QUESTIONS)
+    store.flush()
+    time.sleep(0.3)
+    store.sweep()
+
+    assert store.get("s1") is None
+    assert make_store().get("s1") is None
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Parse success rate and throughput for LLM output parsing.
+
+Runs the messy model outputs in benchmarks/llm_outputs.jsonl (code fences,
+prose around the JSON, trailing commas, truncation, stray brackets...)
+through the question, evaluation and batch parsers. It compares the
+brace-balanced extractor against the greedy regex it replaced. Both feed
+the same schema validation, so only the extraction differs. It also times
+both on long, bracket-heavy text.
+
+    python benchmarks/bench_json_extract.py [iterations]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from services import openai_service  # noqa: E402
+from services.openai_service import _parse_evaluation, _parse_questions, _split_batch  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(__file__), "llm_outputs.jsonl")
+
+
+def greedy_parse_json(text: str, accept=None):
+    """The previous safe_parse_json."""
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except Exception:
+        match = re.search(r"(\{.*\}|\[.*\])", text, re.S)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except Exception:
+                pass
+        return {"raw": text}
+
+
+def parse_case(case):
+    kind, text, expect = case["kind"], case["text"], case["expect"]
+    if kind == "questions":
+        questions, valid = _parse_questions(text, "Software Engineer", "technical", 4)
+        return len(questions) == expect["count"] if valid else expect["count"] == 0
+    if kind == "evaluation":
+        res = _parse_evaluation(text, expect["question_id"])
+        return res.get("question_id") == expect["question_id"] and res.get("scores", {}).get("technical") == expect["technical"]
+    results = _split_batch(text, [({"id": i}, "") for i in expect["ids"]])
+    return isinstance(results, list) and all(r is not None for r in results)
+
+
+def run(label, parser, cases, iterations):
+    openai_service.safe_parse_json = parser
+    failed = [c["name"] for c in cases if not parse_case(c)]
+    size = sum(len(c["text"]) for c in cases)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for case in cases:
+            parse_case(case)
+    elapsed = time.perf_counter() - start
+    ok = len(cases) - len(failed)
+    print(f"{label:<10} {ok:>3}/{len(cases)} parsed correctly  "
+          f"{len(cases) * iterations / elapsed:>9.0f} outputs/s  {size * iterations / elapsed / 1e6:>6.1f} MB/s")
+    for name in failed:
+        print(f"{'':<12}miss: {name}")
+
+
+def pathological(label, parser):
+    prose = "Consider {this} and [that] trade-off, then revisit it. " * 400
+    unclosed = "Step {1: weigh the options, step {2: pick one. " * 400
+    evaluation = '{"question_id": 1, "scores": {"technical": 7}, "feedback": "ok"}'
+    texts = {
+        "json then bracketed prose": evaluation + "\n" + prose,
+        "bracketed prose, no json": prose,
+        "unclosed braces then json": unclosed + evaluation,
+        "unclosed braces, no json": unclosed,
+    }
+    for name, text in texts.items():
+        start = time.perf_counter()
+        parser(text)
+        print(f"{label:<10} {name:<28} {(time.perf_counter() - start) * 1000:>9.2f} ms ({len(text) // 1024} KB)")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with open(CORPUS, encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+
+    balanced = openai_service.safe_parse_json
+    run("greedy", greedy_parse_json, cases, iterations)
+    run("balanced", balanced, cases, iterations)
+    print()
+    pathological("greedy", greedy_parse_json)
+    pathological("balanced", balanced)
+    openai_service.safe_parse_json = balanced
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for PDF report rendering.
+
+Compares rendering with templates rebuilt for every report (what each call
+paid before templates were shared) against the process-wide templates.
+
+    python benchmarks/bench_pdf_templates.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from services.pdf_service import PDFService, ReportTemplates  # noqa: E402
+
+SESSION = {
+    "meta": {"name": "Bench User", "role": "Software Engineer", "domain": "backend",
+             "experience": "1-3 years", "mode": "technical"},
+    "questions": [{"id": i, "question": f"Explain how you would design component {i}."} for i in range(1, 5)],
+    "answers": [
+        {
+            "question_id": i,
+            "answer": "I would start by splitting the problem into smaller services. " * 6,
+            "evaluation": {
+                "scores": {"technical": 7, "communication": 6, "confidence": 8},
+                "feedback": "Good structure, but the trade-offs need more depth. " * 4,
+                "examples_or_corrections": "Mention caching and failure handling explicitly. " * 3,
+            },
+        }
+        for i in range(1, 5)
+    ],
+}
+REPORT = {"overall_score": 7.0, "avg_technical": 7.0, "avg_communication": 6.0, "avg_confidence": 8.0,
+          "resources": ["Designing Data-Intensive Applications", "System Design Primer"], "n_questions": 4}
+
+
+def bench(label: str, make_service, iterations: int):
+    for kind in ("report", "summary"):
+        start = time.process_time()
+        for _ in range(iterations):
+            service = make_service()
+            if kind == "report":
+                service.render_interview_report(SESSION, REPORT)
+            else:
+                service.render_summary(SESSION, REPORT)
+        per_call = (time.process_time() - start) / iterations * 1000
+        print(f"{label:<10} {kind:<8} {per_call:7.2f} ms CPU/report")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    shared = PDFService()
+    shared.render_summary(SESSION, REPORT)  # warm fonts and imports
+    bench("rebuilt", lambda: PDFService(ReportTemplates()), iterations)
+    bench("shared", lambda: shared, iterations)
+
+
+if __name__ == "__main__":
+    main()
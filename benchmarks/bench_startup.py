@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Backend cold-start time per provider configuration.
+
+Each configuration runs in a fresh interpreter and reports:
+- how long `import main` takes;
+- how long the configured providers' SDKs take to load (what LLM_WARMUP,
+  or the first request to that provider, pays);
+- what importing every SDK at startup, as the backend used to, would have
+  cost on top.
+
+    python benchmarks/bench_startup.py [--repeat 5] [--configs fake gemini groq openai gemini,groq,openai]
+
+SDKs that aren't installed are reported as such rather than timed.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+
+def child(config: str):
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+    started = time.perf_counter()
+    import main  # noqa: F401
+    imported = time.perf_counter() - started
+
+    from services import openai_service
+    from services.provider_sdks import SDKS
+
+    warm = openai_service.warm_up("" if config == "fake" else config)
+    # Everything else, i.e. what eager imports at module load used to add
+    rest = {}
+    for name, sdk in SDKS.items():
+        if not sdk.loaded:
+            rest[name] = sdk.import_seconds if sdk.available() else "not installed"
+    print(json.dumps({"import_main": imported, "warm_up": warm, "eager_rest": rest}))
+
+
+def run(config: str, repeat: int):
+    env = {**os.environ, "QUESTION_BANK_ENABLED": "0", "TRACE_SAMPLE_RATE": "0", "LLM_WARMUP": ""}
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable, __file__, "--child", config], env=env,
+                             capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result["process"] = time.perf_counter() - started
+        samples.append(result)
+    return samples
+
+
+def _timed(timings: dict) -> float:
+    # Warm-up reports an error string instead of seconds for SDKs that failed to load
+    return sum(v for v in timings.values() if not isinstance(v, str))
+
+
+def report(config: str, samples):
+    def median(fn):
+        return statistics.median(fn(s) for s in samples) * 1000
+
+    import_ms = median(lambda s: s["import_main"])
+    sdk_ms = median(lambda s: _timed(s["warm_up"]))
+    eager_ms = import_ms + median(lambda s: _timed(s["warm_up"]) + _timed(s["eager_rest"]))
+    missing = sorted({name for s in samples for name, v in {**s["warm_up"], **s["eager_rest"]}.items()
+                      if isinstance(v, str)})
+    print(f"{config:<22}{import_ms:>12.0f}{sdk_ms:>12.0f}{median(lambda s: s['process']):>12.0f}{eager_ms:>14.0f}"
+          f"   {'not installed: ' + ', '.join(missing) if missing else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--configs", nargs="*", default=["fake", "gemini", "groq", "openai", "gemini,groq,openai"])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child)
+        return
+
+    print(f"{'providers':<22}{'import ms':>12}{'SDK ms':>12}{'process ms':>12}{'eager ms':>14}")
+    print("-" * 72)
+    for config in args.configs:
+        report(config, run(config, args.repeat))
+    print("\nimport: `import main`; SDK: loading the configured providers' SDKs; process: whole child run;\n"
+          "eager: import plus every installed SDK, as when all were imported at module load.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test: start -> answer -> finalize -> export, at a given concurrency.
+
+Runs the backend in-process against the fake LLM provider by default, so it
+needs no server and no API keys:
+
+    python benchmarks/load_test.py --sessions 200 --concurrency 20
+
+Tune the fake provider with FAKE_LLM_LATENCY (e.g. lognormal:800:0.4,
+uniform:200:600, fixed:0), FAKE_LLM_ERROR_RATE and FAKE_LLM_SEED. Point it at
+a running server with --url (the server must have the provider configured;
+for the fake provider, FAKE_LLM_ENABLED=1).
+Reports count, errors, p50/p95/p99 latency and requests/sec per endpoint.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client, name, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = await client.request(method, path, **kwargs)
+            ok = resp.status_code < 400
+        except httpx.HTTPError:
+            resp, ok = None, False
+        self.latencies[name].append(time.perf_counter() - start)
+        if not ok:
+            self.errors[name] += 1
+        return resp if ok else None
+
+    def report(self, elapsed):
+        header = f"{'endpoint':<34}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}"
+        print(header)
+        print("-" * len(header))
+        total = 0
+        for name, samples in self.latencies.items():
+            total += len(samples)
+            print(f"{name:<34}{len(samples):>7}{self.errors[name]:>8}"
+                  f"{percentile(samples, 0.50) * 1000:>10.1f}{percentile(samples, 0.95) * 1000:>10.1f}"
+                  f"{percentile(samples, 0.99) * 1000:>10.1f}{len(samples) / elapsed:>9.1f}")
+        print(f"\n{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+
+
+async def run_session(client, rec, args):
+    resp = await rec.call(client, "POST /start", "POST", "/interview/start", json={
+        "role": args.role, "domain": "backend", "experience": "1-3 years", "mode": "technical",
+        "model_provider": args.provider,
+    })
+    if resp is None:
+        return
+    body = resp.json()
+    sid = body["session_id"]
+    questions = body["questions"][:args.answers]
+
+    if args.answer_mode == "batch":
+        await rec.call(client, "POST /session/{id}/answers:batch", "POST", f"/interview/session/{sid}/answers:batch",
+                       json={"answers": [{"question_id": q["id"], "answer": "A sample answer."} for q in questions]})
+    else:
+        path = "/answer/stream" if args.answer_mode == "stream" else "/answer"
+        for q in questions:
+            await rec.call(client, f"POST /session/{{id}}{path}", "POST", f"/interview/session/{sid}{path}",
+                           json={"question_id": q["id"], "answer": "A sample answer with some detail."})
+
+    if await rec.call(client, "POST /session/{id}/finalize", "POST", f"/interview/session/{sid}/finalize") is None:
+        return
+    for export in args.exports:
+        await rec.call(client, f"GET /session/{{id}}/export/{export}", "GET", f"/interview/session/{sid}/export/{export}")
+
+
+async def drive(client, args):
+    rec = Recorder()
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with sem:
+            await run_session(client, rec, args)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.sessions)))
+    rec.report(time.perf_counter() - start)
+
+
+@contextlib.asynccontextmanager
+async def in_process_client(timeout):
+    sys.path.insert(0, BACKEND_DIR)
+    import main
+
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+            yield client
+
+
+async def amain(args):
+    if args.url:
+        limits = httpx.Limits(max_connections=args.concurrency * 2)
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            await drive(client, args)
+    else:
+        async with in_process_client(args.timeout) as client:
+            await drive(client, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running backend; omit to run in-process")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--answers", type=int, default=4, help="Answers per session")
+    parser.add_argument("--answer-mode", choices=["single", "stream", "batch"], default="single")
+    parser.add_argument("--exports", nargs="*", default=["full"], help="Export variants: full, summary, full/base64...")
+    parser.add_argument("--provider", default="fake")
+    parser.add_argument("--role", default="Software Engineer")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    # Keep the in-process run self-contained and repeatable
+    os.environ.setdefault("QUESTION_BANK_ENABLED", "0")
+    os.environ.setdefault("QUESTION_CACHE_ENABLED", "0")
+    if args.provider == "fake":
+        os.environ.setdefault("FAKE_LLM_ENABLED", "1")
+    os.environ.setdefault("FAKE_LLM_LATENCY", "lognormal:300:0.4")
+    os.environ.setdefault("EXPORTS_MAX_AGE_HOURS", "0")
+    os.environ.setdefault("EXPORTS_MAX_BYTES", "0")
+    asyncio.run(amain(args))
+
+
+if __name__ == "__main__":
+    main()
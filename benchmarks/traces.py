@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Per-stage latency from the backend's request traces.
+
+Enable tracing on the backend, e.g. TRACE_SAMPLE_RATE=0.1 (optionally
+TRACE_EXPORT=jsonl:traces.jsonl, the default), then summarise where the
+time goes for each route:
+
+    python benchmarks/traces.py report traces.jsonl
+    python benchmarks/traces.py report traces.jsonl --route "POST /interview/session/{session_id}/answer"
+
+`collect` is a local stand-in for an OTLP/HTTP collector: point the backend
+at it with TRACE_EXPORT=otlp:http://localhost:4318/v1/traces and it appends
+the received spans to a JSONL file in the same format the report reads.
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def request_roots(spans):
+    """Map each span id to its request span: the nearest ancestor whose parent is not in the file."""
+    by_id = {s["span_id"]: s for s in spans}
+    root_of = {}
+
+    def find(s):
+        chain = []
+        while s["span_id"] not in root_of and s["parent_id"] in by_id:
+            chain.append(s)
+            s = by_id[s["parent_id"]]
+        root = root_of.setdefault(s["span_id"], s)
+        for c in chain:
+            root_of[c["span_id"]] = root
+        return root
+
+    for s in spans:
+        find(s)
+    return root_of
+
+
+def report(spans, route=None):
+    root_of = request_roots(spans)
+    by_route = defaultdict(list)
+    for s in spans:
+        if root_of[s["span_id"]] is s and (route is None or s["name"] == route):
+            by_route[s["name"]].append(s)
+
+    stages = defaultdict(lambda: defaultdict(list))  # route -> span name -> [(ms, share of request)]
+    errors = defaultdict(int)
+    for s in spans:
+        root = root_of[s["span_id"]]
+        if root is s or root["name"] not in by_route:
+            continue
+        share = s["duration_ms"] / root["duration_ms"] if root["duration_ms"] else 0.0
+        stages[root["name"]][s["name"]].append((s["duration_ms"], share))
+        if s.get("error"):
+            errors[(root["name"], s["name"])] += 1
+
+    header = f"  {'stage':<28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'share':>8}{'errors':>8}"
+    for name, requests in sorted(by_route.items(), key=lambda kv: -len(kv[1])):
+        durations = [r["duration_ms"] for r in requests]
+        print(f"{name}  ({len(requests)} traces, p50 {percentile(durations, 0.5):.1f} ms, "
+              f"p95 {percentile(durations, 0.95):.1f} ms)")
+        print(header)
+        for stage, samples in sorted(stages[name].items(), key=lambda kv: -sum(ms for ms, _ in kv[1])):
+            ms = [m for m, _ in samples]
+            share = sum(sh for _, sh in samples) / len(requests)
+            print(f"  {stage:<28}{len(samples):>7}{percentile(ms, 0.5):>10.1f}{percentile(ms, 0.95):>10.1f}"
+                  f"{share:>8.0%}{errors[(name, stage)]:>8}")
+        print()
+
+
+def _attr_value(value):
+    for kind in ("stringValue", "boolValue", "doubleValue"):
+        if kind in value:
+            return value[kind]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+
+def from_otlp(payload):
+    """Span records, in the backend's JSONL format, from an OTLP/HTTP JSON request body."""
+    for resource in payload.get("resourceSpans", []):
+        for scope in resource.get("scopeSpans", []):
+            for s in scope.get("spans", []):
+                start, end = int(s["startTimeUnixNano"]), int(s["endTimeUnixNano"])
+                status = s.get("status") or {}
+                yield {
+                    "trace_id": s["traceId"],
+                    "span_id": s["spanId"],
+                    "parent_id": s.get("parentSpanId") or None,
+                    "name": s["name"],
+                    "start_ns": start,
+                    "duration_ms": round((end - start) / 1e6, 3),
+                    "attrs": {a["key"]: _attr_value(a["value"]) for a in s.get("attributes", [])},
+                    "error": status.get("message") if status.get("code") == 2 else None,
+                }
+
+
+def collect(port, out):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                records = list(from_otlp(json.loads(body)))
+            except (ValueError, KeyError) as e:
+                self.send_error(400, str(e))
+                return
+            with open(out, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(r) + "\n" for r in records)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    print(f"Collecting OTLP/HTTP JSON on http://localhost:{port}/v1/traces into {out}", file=sys.stderr)
+    ThreadingHTTPServer(("", port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report", help="Per-route, per-stage latency from a JSONL trace file")
+    rep.add_argument("path")
+    rep.add_argument("--route", help='Only this route, e.g. "POST /interview/start"')
+    col = sub.add_parser("collect", help="Receive OTLP/HTTP JSON spans and append them to a JSONL file")
+    col.add_argument("--port", type=int, default=4318)
+    col.add_argument("--out", default="traces.jsonl")
+    args = parser.parse_args()
+
+    if args.command == "report":
+        report(load(args.path), args.route)
+    else:
+        collect(args.port, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,48 @@ API = PROD_API  # Change to LOCAL_API for local development
 
 st.set_page_config(page_title="AI Interview Prep", layout="centered")
 
+
+def render_feedback_card(container, text):
+    container.markdown(f"""
+        <div class="feedback-card">
+            <h5>🤖 AI Feedback</h5>
+            <p>{text}</p>
+        </div>
+    """, unsafe_allow_html=True)
+
+
+def stream_answer(sid, payload, container):
+    """Submit an answer to the SSE endpoint, rendering feedback as it streams in.
+
+    Returns (status_code, data) shaped like the plain /answer endpoint.
+    """
+    with requests.post(f"{API}/session/{sid}/answer/stream", json=payload, stream=True, timeout=120) as resp:
+        if resp.status_code != 200:
+            try:
+                return resp.status_code, resp.json()
+            except (ValueError, json.JSONDecodeError):
+                return resp.status_code, {"detail": resp.text}
+
+        feedback = ""
+        event = None
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:"):])
+                if event == "feedback_delta":
+                    feedback += data.get("text", "")
+                    render_feedback_card(container, feedback + " ▌")
+                elif event == "feedback":
+                    feedback = data.get("feedback", feedback)
+                    render_feedback_card(container, feedback)
+                elif event == "result":
+                    return 200, data
+                elif event == "error":
+                    return 400, {"detail": data}
+    return 500, {"detail": "Evaluation stream ended unexpectedly."}
+
+
 # Add connection status check
 try:
     response = requests.get(f"{API}/health", timeout=5)
@@ -554,19 +596,11 @@ if st.session_state.get("session"):
                     with st.spinner("🤖 AI is evaluating your answer..."):
                         payload = {"question_id": q['id'], "answer": ans}
                         try:
-                            resp = requests.post(f"{API}/session/{sid}/answer", json=payload)
-                            try:
-                                feedback_data = resp.json()
-                            except (ValueError, json.JSONDecodeError):
-                                feedback_data = {}
-
-                            if resp.status_code == 200:
-                                st.markdown(f"""
-                                    <div class="feedback-card">
-                                        <h5>🤖 AI Feedback</h5>
-                                        <p>{feedback_data.get('feedback', 'Good answer!')}</p>
-                                    </div>
-                                """, unsafe_allow_html=True)
+                            feedback_box = st.empty()
+                            status_code, feedback_data = stream_answer(sid, payload, feedback_box)
+
+                            if status_code == 200:
+                                render_feedback_card(feedback_box, feedback_data.get('feedback', 'Good answer!'))
 
                                 scores = feedback_data.get('scores', {}) if isinstance(feedback_data, dict) else {}
                                 if isinstance(scores, dict) and scores:
@@ -591,7 +625,7 @@ if st.session_state.get("session"):
                                         used = "Your key" if err.get("used_user_key") else "Fallback key"
                                         st.error(f"❌ {msg}\n\n**Provider:** {prov} | **Key Used:** {used}")
                                     else:
-                                        st.error(f"❌ {err or resp.text}")
+                                        st.error(f"❌ {err or 'Evaluation failed.'}")
                                 except Exception:
                                     st.error("❌ Evaluation failed unexpectedly.")
                         except requests.exceptions.ConnectionError:
@@ -816,9 +850,22 @@ if st.session_state.get("session"):
                 if st.button("📥 Download Full Report PDF", help="Download complete report as PDF", use_container_width=True):
                     with st.spinner("📄 Generating PDF..."):
                         try:
-                            response = requests.get(f"{API}/session/{sid}/export/full")
-                            if response.status_code == 200:
+                            # Revalidate with the backend's ETag; a 304 reuses the PDF we already have
+                            cached_pdf = st.session_state.get("report_pdf")
+                            headers = {}
+                            if cached_pdf and cached_pdf.get("sid") == sid:
+                                headers["If-None-Match"] = cached_pdf["etag"]
+                            response = requests.get(f"{API}/session/{sid}/export/full", headers=headers)
+                            pdf_data = None
+                            if response.status_code == 304:
+                                pdf_data = cached_pdf["data"]
+                            elif response.status_code == 200:
                                 pdf_data = response.content
+                                if response.headers.get("ETag"):
+                                    st.session_state["report_pdf"] = {
+                                        "sid": sid, "etag": response.headers["ETag"], "data": pdf_data
+                                    }
+                            if pdf_data is not None:
                                 filename = f"interview_report_{candidate_name}_{sid[:8]}.pdf"
 
                                 st.download_button(